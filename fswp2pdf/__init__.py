@@ -2,8 +2,8 @@
 # file: __init__.py
 # content: init file for fswp2pdf package
 # created: 2025 January 11 Saturday
-# modified: 2025 January 16 Wednesday
-# modification: clean up
+# modified: 2026 October 17 Saturday
+# modification: import time budget test
 # author: roch schanen
 # comment: package is under heavy development, version 0.0.0
 
@@ -28,6 +28,15 @@ version 0.0 (15 January 2025)
     add version property: version = "0.0.0"
 
 """
+
+version_history["0.1"] = """
+version 0.1 (17 October 2026)
+
+    heavy modules are imported on first use: scipy.optimize (sfitlib),
+    matplotlib.pyplot and the pdf backend (splotlib). The test measures
+    the import time of the package modules with "python -X importtime".
+
+"""
  
 ########
 # info #
@@ -93,6 +102,43 @@ if __name__ == "__main__":
 
         print("done.")
 
+    #############
+    # tests 0.1 #
+    #############
+
+    if current_version == "0.1":
+
+        from sys import executable
+        from subprocess import run
+
+        # import time budget (milli-seconds) for the package modules
+        budget = 250.0
+
+        # run from the parent folder to import the local package
+        r = run([executable, "-X", "importtime", "-c",
+            "import fswp2pdf.sielib, fswp2pdf.sfitlib, fswp2pdf.splotlib"],
+            cwd = "..", capture_output = True, text = True)
+
+        # "import time: self [us] | cumulative | imported package"
+        T, total = {}, 0.0
+        for l in r.stderr.splitlines()[1:]:
+            self_us, cumulative_us, name = l[12:].split("|")
+            T[name.strip()] = float(cumulative_us)*1E-3
+            # top level imports only
+            if not name.startswith("  "): total += float(cumulative_us)*1E-3
+
+        print()
+        print(f"import time:")
+        print(f"------------")
+        for m in ["fswp2pdf.sielib", "fswp2pdf.sfitlib", "fswp2pdf.splotlib"]:
+            print(f"\t{m:<20}: {T[m]:8.1f} ms")
+        print(f"\t{'total':<20}: {total:8.1f} ms (budget {budget:.0f} ms)")
+        for m in ["scipy.optimize", "matplotlib.pyplot", "matplotlib.backends.backend_pdf"]:
+            print(f"\t{m:<32}: {'imported' if m in T else 'deferred'}")
+        print(f"\t{'within budget' if total < budget else 'OVER BUDGET'}")
+
+        print("done.")
+
     #############
     # tests x.x #
     #############
@@ -0,0 +1,10 @@
+# file: __main__.py
+# content: "python -m fswp2pdf" runs the fswp2pdf command
+# Created: 17 October 2026
+# Author: Roch Schanen
+# comments: see scmdlib.py
+
+from fswp2pdf.scmdlib import main
+
+if __name__ == "__main__":
+    exit(main())
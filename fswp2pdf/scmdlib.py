@@ -0,0 +1,789 @@
+# file: scmdlib.py
+# content: command line interface, frequency sweep(s) to pdf document(s)
+# Created: 17 October 2026
+# Author: Roch Schanen
+# comments: installed as the "fswp2pdf" console command (see setup.py)
+
+version_history = {}
+
+"""
+
+    usage: fswp2pdf {page,document,plot} [options] files...
+           fswp2pdf watch [options] folder
+
+    layouts:
+
+        page        one pdf per data file (next to the data file)
+        document    one page per data file, in one pdf document
+        plot        all the data files on one plot, in one pdf document
+        watch       convert the new data files of a folder as they
+                    appear (see Watch())
+
+    files are data files, glob patterns ("data/*_full_*.dat") or folders
+    (the files of the folder matching --pattern). A file given twice is
+    converted once, in the order of the first occurrence. A path that
+    matches no file is reported as failed. The exit status is 1 when
+    any file failed (0 otherwise).
+
+    options:
+
+        -j, --jobs N    worker processes (default 1, 0: all the cores)
+        --cache FP      fit results cache (default "fswp2pdf-cache.json"
+                        next to the output: the pdf files of the page
+                        layout, the document, the watched folder)
+        --no-cache      do not use a fit results cache
+        --output FP     output folder (page) or document (document and
+                        plot: default "singledocument.pdf" and
+                        "singleplot.pdf")
+        --pattern P     file name pattern in folders (default
+                        "*_full_*.dat")
+        --sidecar       import the data files through binary sidecar
+                        files (".bin", written on the first import)
+        --log           write the stages (json lines) next to the output
+                        (page: "fswp2pdf.jsonl" next to the pdf files)
+        --profile       also dump the cProfile statistics (main process)
+
+    watch options (no --jobs):
+
+        --interval S    polling interval in seconds (default 5.0)
+        --settle S      minimum age of a complete file (default 60.0)
+        --existing      also convert the files present at start up
+        --retries N     conversion attempts of a failing file (default 3)
+
+    All the files are processed in one process (or one pool of worker
+    processes): the packages are imported and the page layout is built
+    once per batch. Sweep() and Page() are the shared import, fit and
+    render pipeline.
+
+"""
+
+# built-in imports
+# ----------------
+from os import stat
+from os import replace
+from os import makedirs
+from os import cpu_count
+from os.path import join
+from os.path import isdir
+from os.path import exists
+from os.path import basename
+from os.path import dirname
+from glob import glob
+from re import split
+from time import sleep
+from time import time as now
+from argparse import ArgumentParser
+
+# from package: "https://numpy.org/"
+# ----------------------------------
+
+from numpy.linalg import norm
+
+# From the local package
+# ----------------------
+try: # import from built
+    from fswp2pdf import sielib
+    from fswp2pdf import sfitlib
+    from fswp2pdf import splotlib
+    from fswp2pdf import sproflib
+except ImportError as error:
+    # local import
+    import sielib
+    import sfitlib
+    import splotlib
+    import sproflib
+
+#########
+# files #
+#########
+
+def _natural(s):
+    # "file_2" before "file_10"
+    return [int(t) if t.isdigit() else t for t in split(r"(\d+)", s)]
+
+def Files(paths, pattern = "*_full_*.dat"):
+    # expand the folders (pattern) and the globs, in order, once each:
+    # return the files and the paths matching no file
+    F, S, U = [], set(), []
+    for p in paths:
+        if isdir(p):
+            L = sorted(glob(join(p, pattern)), key = _natural)
+        elif exists(p):
+            L = [p]
+        else:
+            L = sorted(glob(p), key = _natural)
+        if not L: U.append(p)
+        for a in L:
+            if a in S: continue
+            F.append(a)
+            S.add(a)
+    return F, U
+
+############
+# pipeline #
+############
+
+class Sweep():
+
+    """
+
+        Sweep(fp[, entry][, fit][, sidecar]) imports the data file fp
+        (through its binary sidecar if sidecar is True, see sielib) and
+        fits both channels, unless the cached fit results entry are
+        given (then only the fit curves are computed). Attributes: info, name, the
+        columns T, F, X, Y, the parameters pAbs, pDis, the fit curves
+        XF, YF and entry: the new fit results to cache (or None).
+
+    """
+
+    def __init__(self, fp, entry = None, fit = True, sidecar = False):
+        self.fp = fp
+        self.info, (self.T, self.F, self.X, self.Y) = \
+            sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp, sidecar)
+        self.name = list(self.info.values())[0]
+        self.entry = None
+        if not fit: return
+        F, X, Y = self.F, self.X, self.Y
+        if entry is None:
+            # guess parameters, fit (analytic Jacobians) and compute fit's data points
+            (pAbs, pAbsCov, XF), (pDis, pDisCov, YF) = sfitlib.LorentzFit(F, X, Y)
+            self.entry = self.info, dict(pAbs = pAbs, pAbsCov = pAbsCov,
+                pDis = pDis, pDisCov = pDisCov)
+        else:
+            # cached parameters: compute fit's data points only
+            pAbs, pDis = entry[1]["pAbs"], entry[1]["pDis"]
+            XF = sfitlib.LorentzAbsorptionFit_Function(F, *pAbs)
+            YF = sfitlib.LorentzDispersionFit_Function(F, *pDis)
+        self.pAbs, self.pDis, self.XF, self.YF = pAbs, pDis, XF, YF
+        return
+
+    def header(self):
+        # file info text block
+        return "".join([f"{k:<8}: {v}\n" for k, v in self.info.items()])
+
+# page layout (built once per process, updated for every sweep)
+_Template = None
+
+def Page(s):
+
+    """ update the page layout with the sweep s and return its figure """
+
+    global _Template
+
+    if _Template is None:
+        _Template = splotlib.PageTemplate(
+            # measured points (all plotted), fitted lines (decimated)
+            (".b",),
+            (".r",),
+            ("-.k", {"linewidth": 0.6, "decimate": True}),
+            ("-.k", {"linewidth": 0.6, "decimate": True}),
+            texts = ("top", "bottom"))
+
+    # rescale data to engineer units
+    factor_f, prefix_f = splotlib.GetUnitPrefix(s.F)
+    factor_xy, prefix_xy = splotlib.GetUnitPrefix(s.X, s.Y, s.XF, s.YF)
+    F = s.F*factor_f
+    X, Y, XF, YF = [v*factor_xy for v in (s.X, s.Y, s.XF, s.YF)]
+
+    # swap data, ranges, ticks, labels and texts
+    return _Template.update((F, X), (F, Y), (F, XF), (F, YF),
+        texts = (s.header(), sfitlib.LorentzFitParametersDisplay(s.pAbs, s.pDis)),
+        xlabel = f"Frequency / {prefix_f}Hz",
+        ylabel = f"Signal / {prefix_xy}V")
+
+def Plot(sweeps):
+
+    """ plot all the sweeps on one figure and return its handles """
+
+    from matplotlib import colormaps
+
+    # rescale data to engineer units (common to all the sweeps)
+    factor_f, prefix_f = splotlib.GetUnitPrefix(*[s.F for s in sweeps])
+    factor_xy, prefix_xy = splotlib.GetUnitPrefix(
+        *[s.X for s in sweeps], *[s.Y for s in sweeps])
+    F = [s.F*factor_f for s in sweeps]
+    X = [s.X*factor_xy for s in sweeps]
+    Y = [s.Y*factor_xy for s in sweeps]
+
+    fg, ax = splotlib.MakeFigure()
+    m = colormaps['Set1']
+    with splotlib.Handles(fg, ax):
+        for i, (s, f, x, y) in enumerate(zip(sweeps, F, X, Y)):
+            splotlib.Plot(f, x, "-", color = m(i), label = s.name)
+            splotlib.Plot(f, y, "-", color = m(i))
+        splotlib.legend()
+        splotlib.Xlabel(f"Frequency / {prefix_f}Hz")
+        splotlib.Ylabel(f"Signal / {prefix_xy}V")
+        splotlib.AutoRange("x", *F)
+        splotlib.AutoRange("y", *X, *Y)
+        splotlib.AutoTick("x")
+        splotlib.AutoTick("y")
+        splotlib.AutoGrid()
+
+    # done
+    return fg, ax
+
+###########
+# workers #
+###########
+
+def _initworker(log = False):
+    # the stages are sent back to the main process
+    if log: sproflib.Enable()
+    return
+
+def _task(args):
+    # convert one file: write its pdf (page) or return its page (document)
+    layout, a, key, entry, output, sidecar = args
+    try:
+        with sproflib.Stage("sweep", file = a):
+            s = Sweep(a, entry, sidecar = sidecar)
+            data = splotlib.RenderPage(Page(s))
+            if layout == "page":
+                with open(output, "wb") as fh:
+                    fh.write(data)
+                data = None
+    except Exception as error:
+        return a, key, f"{type(error).__name__}: {error}", None, None, sproflib.Records()
+    return a, key, None, s.entry, data, sproflib.Records()
+
+def _pdfpath(a, folder = None):
+    # pdf file of the data file a (next to it, or in the output folder)
+    fp = a[:-len(a.split('.')[-1])]+"pdf"
+    return join(folder, basename(fp)) if folder else fp
+
+#########
+# watch #
+#########
+
+def _stamp(a):
+    # date and time of the sweep file a (header line only)
+    try:
+        with open(a, "r") as fh:
+            info = sielib._parseFreqScanHeader(fh.readline(), a)
+        return info["date"], info["time"]
+    except (OSError, ValueError, IndexError):
+        return None
+
+def Watch(folder, output = None, pattern = "*_full_*.dat", interval = 5.0,
+        settle = 60.0, existing = False, retries = 3, cache = None,
+        sidecar = False):
+
+    """
+
+        Watch(folder[, output][, pattern][, interval][, settle]
+        [, existing][, retries][, cache][, sidecar]) converts the new
+        sweep files of the folder as they appear, until interrupted
+        (Ctrl-C).
+
+        A file is converted once it is completely written: its size and
+        modification time are unchanged over one polling interval and,
+        either it has not been modified for "settle" seconds, or a newer
+        sweep file has appeared. Its page is written to its own pdf file
+        (next to the data file) and appended to the running document
+        (output, default "folder/watch.pdf"). Its fit results are
+        appended to the summary table (the document name ending with
+        "_.dat", as the acquisition program names it) and stored in the
+        fit results cache (a FitCache, or None). The sweeps are imported
+        through their binary sidecar if sidecar is True.
+
+        The running document and the summary table are continued from
+        one session to the next: the sweeps listed in the summary table
+        (same date and time) are not converted again. The files present
+        at start up are skipped (unless existing is True). A failed
+        conversion is tried again at the next polls, up to retries times
+        (or when the file changes). The document is written to a
+        temporary file, then replaces the previous one: its pages are
+        kept in memory (splotlib.CatDocument), a new page is added
+        without reading the document again.
+
+    """
+
+    if output is None: output = join(folder, "watch.pdf")
+    summary = output[:-len(output.split('.')[-1])-1]+"_.dat"
+
+    # continue the running document
+    document = splotlib.CatDocument(output)
+    try:
+        document.load()
+    except Exception as error:
+        # unreadable: keep it aside, start a new document
+        replace(output, output+".old")
+        print(f"'{output}' cannot be continued ({type(error).__name__}), moved to '{output}.old'")
+
+    # sweeps of the previous sessions (summary table)
+    listed = set()
+    if exists(summary):
+        T = sielib.import_FitSummary(summary)
+        listed = set(zip(T["date"], T["time"]))
+
+    # files already present are skipped (unless existing)
+    S = glob(join(folder, pattern))
+    done = set(S) if not existing else set([a for a in S if _stamp(a) in listed])
+
+    print(f"watching: {join(folder, pattern)} ({document.pages} pages in '{output}')")
+
+    seen, failed = {}, {}
+    try:
+        while True:
+            S = {}
+            for a in glob(join(folder, pattern)):
+                try:
+                    S[a] = stat(a)
+                except OSError:
+                    pass
+            latest = max([st.st_mtime for st in S.values()], default = 0.0)
+            for a in sorted(S, key = _natural):
+                if a in done: continue
+                # wait until the file is unchanged over one interval
+                st = S[a]
+                signature = (st.st_size, st.st_mtime_ns)
+                if seen.get(a) != signature or not st.st_size:
+                    seen[a] = signature
+                    continue
+                # and until it is old enough, or a newer file exists
+                if now()-st.st_mtime < settle and st.st_mtime >= latest:
+                    continue
+                # give up after retries failures (until the file changes)
+                n = failed[a][1] if failed.get(a, (None,))[0] == signature else 0
+                if n >= retries: continue
+                # convert
+                try:
+                    key = cache.key(a) if cache else None
+                    with sproflib.Stage("sweep", file = a):
+                        s = Sweep(a, cache.get(key) if key else None, sidecar = sidecar)
+                        page = splotlib.RenderPage(Page(s))
+                        with open(_pdfpath(a), "wb") as fh:
+                            fh.write(page)
+                        # append the page to the running document
+                        document.addpage(page)
+                    sielib.export_FitSummary(summary, s.info, s.pAbs, s.pDis,
+                        norm(s.X-s.XF), norm(s.Y-s.YF))
+                    if key and s.entry:
+                        info, fits = s.entry
+                        cache.put(key, info, **fits)
+                        _saveCache(cache)
+                except Exception as error:
+                    failed[a] = signature, n+1
+                    print(f"\t{a}: failed ({type(error).__name__}: {error})"
+                        f"{'' if n+1 < retries else ', given up'}")
+                    continue
+                done.add(a)
+                failed.pop(a, None)
+                print(f"\t{a}: done")
+            sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+    # done
+    return
+
+#############
+# interface #
+#############
+
+def _FitCache(pathname):
+    # fit results cache (None: no cache)
+    if not pathname: return None
+    cache = sielib.FitCache(pathname, sfitlib.FIT_MODEL_VERSION)
+    if cache.error:
+        print(f"fit results cache '{pathname}' not read ({cache.error}), started empty")
+    return cache
+
+def _saveCache(cache):
+    # a cache that cannot be written is reported, the run goes on
+    try:
+        cache.save()
+    except OSError as error:
+        print(f"fit results cache '{cache.pathname}' not saved ({type(error).__name__}: {error})")
+    return
+
+def _parser():
+    # options shared by the layouts
+    options = ArgumentParser(add_help = False)
+    options.add_argument("--cache", default = None,
+        help = "fit results cache (default: fswp2pdf-cache.json next to the output)")
+    options.add_argument("--no-cache", dest = "cache", action = "store_const",
+        const = False, help = "do not use a fit results cache")
+    options.add_argument("--output", default = None,
+        help = "output folder (page) or document (document, plot, watch)")
+    options.add_argument("--pattern", default = "*_full_*.dat",
+        help = "file name pattern in folders")
+    options.add_argument("--sidecar", action = "store_true",
+        help = "import the data files through binary sidecar files")
+    options.add_argument("--log", action = "store_true",
+        help = "write the stages (json lines) next to the output")
+    options.add_argument("--profile", action = "store_true",
+        help = "also dump the cProfile statistics")
+    # options of the batch layouts
+    batch = ArgumentParser(add_help = False, parents = [options])
+    batch.add_argument("files", nargs = "+",
+        help = "data files, glob patterns or folders")
+    batch.add_argument("-j", "--jobs", type = int, default = 1,
+        help = "worker processes (0: all the cores)")
+    p = ArgumentParser(prog = "fswp2pdf",
+        description = "frequency sweep(s) to pdf document(s)")
+    layouts = p.add_subparsers(dest = "layout", required = True)
+    for name, text in [
+            ("page",     "one pdf per data file"),
+            ("document", "one page per data file, in one pdf document"),
+            ("plot",     "all the data files on one plot, in one pdf document"),
+            ]:
+        layouts.add_parser(name, parents = [batch], help = text, description = text)
+    # folder watcher
+    text = "convert the new data files of a folder as they appear"
+    watch = layouts.add_parser("watch", parents = [options], help = text, description = text)
+    watch.add_argument("folder", help = "folder to watch")
+    watch.add_argument("--interval", type = float, default = 5.0,
+        help = "polling interval in seconds")
+    watch.add_argument("--settle", type = float, default = 60.0,
+        help = "minimum age of a complete file in seconds")
+    watch.add_argument("--existing", action = "store_true",
+        help = "also convert the files present at start up")
+    watch.add_argument("--retries", type = int, default = 3,
+        help = "conversion attempts of a failing file")
+    return p
+
+def main(args = None):
+
+    """ run the command (args: the argument list, default sys.argv[1:]) """
+
+    o = _parser().parse_args(args)
+
+    if o.layout == "watch":
+        if o.output is None: o.output = join(o.folder, "watch.pdf")
+        if o.log or o.profile:
+            sproflib.Enable(o.output[:-len(o.output.split('.')[-1])]+"jsonl", o.profile)
+        if o.cache is None: o.cache = join(dirname(o.output), "fswp2pdf-cache.json")
+        cache = _FitCache(o.cache)
+        Watch(o.folder, o.output, o.pattern, o.interval, o.settle,
+            o.existing, o.retries, cache, o.sidecar)
+        sproflib.Disable()
+        print(f"done.")
+        return 0
+
+    files, unmatched = Files(o.files, o.pattern)
+    jobs = o.jobs if o.jobs > 0 else cpu_count()
+
+    # outputs
+    if o.layout == "page":
+        if o.output: makedirs(o.output, exist_ok = True)
+        # next to the pdf files (of the first data file without --output)
+        folder = o.output or (dirname(files[0]) if files else ".")
+        logpath = join(folder, "fswp2pdf.jsonl")
+    else:
+        if o.output is None: o.output = f"single{o.layout}.pdf"
+        folder = dirname(o.output)
+        if folder: makedirs(folder, exist_ok = True)
+        logpath = o.output[:-len(o.output.split('.')[-1])]+"jsonl"
+    if o.log or o.profile: sproflib.Enable(logpath, o.profile)
+    if o.cache is None: o.cache = join(folder, "fswp2pdf-cache.json")
+
+    print(f"processing: ")
+
+    # the paths matching no file are failures
+    for p in unmatched:
+        print(f"\t{p}: failed (no file{f' matching {o.pattern!r}' if isdir(p) else ''})")
+    failed = len(unmatched)
+
+    if o.layout == "plot":
+
+        # one figure (no fit)
+        sweeps = []
+        for a in files:
+            try:
+                sweeps.append(Sweep(a, fit = False, sidecar = o.sidecar))
+            except Exception as error:
+                print(f"\t{a}: failed ({type(error).__name__}: {error})")
+                failed += 1
+                continue
+            print(f"\t{a}: done")
+        if sweeps:
+            fg, ax = Plot(sweeps)
+            splotlib.CatPages(o.output, [splotlib.RenderPage(fg)])
+
+    else:
+
+        # open the fit results cache (keyed on the fit model version)
+        cache = _FitCache(o.cache)
+
+        # look up cached fit results in the main process
+        tasks = []
+        for a in files:
+            try:
+                key = cache.key(a) if cache else None
+            except OSError:
+                key = None
+            output = _pdfpath(a, o.output) if o.layout == "page" else None
+            tasks.append((o.layout, a, key, cache.get(key) if key else None, output, o.sidecar))
+
+        if jobs == 1 and o.layout == "document":
+            # serial document: the pages are streamed (shared fonts)
+            doc = splotlib.StreamDocument(o.output)
+            def stream(task):
+                layout, a, key, entry, output, sidecar = task
+                try:
+                    with sproflib.Stage("sweep", file = a):
+                        s = Sweep(a, entry, sidecar = sidecar)
+                        doc.addpage(Page(s))
+                except Exception as error:
+                    return a, key, f"{type(error).__name__}: {error}", None, None, []
+                return a, key, None, s.entry, None, []
+            results = map(stream, tasks)
+        elif jobs == 1:
+            results = map(_task, tasks)
+        else:
+            # worker processes, results in the order of the files
+            from concurrent.futures import ProcessPoolExecutor
+            pool = ProcessPoolExecutor(jobs, initializer = _initworker,
+                initargs = (o.log or o.profile,))
+            results = pool.map(_task, tasks)
+
+        pages = []
+        for a, key, error, entry, data, records in results:
+            for r in records: sproflib.Record(**r)
+            if error:
+                print(f"\t{a}: failed ({error})")
+                failed += 1
+                continue
+            print(f"\t{a}: done{' (cached fit)' if key and entry is None else ''}")
+            if data: pages.append(data)
+            # store the new fit results
+            if entry and key:
+                info, fits = entry
+                cache.put(key, info, **fits)
+
+        if jobs > 1: pool.shutdown()
+
+        if o.layout == "document":
+            if jobs == 1:
+                doc.close()
+            elif pages:
+                # pages merged in the order of the files
+                splotlib.CatPages(o.output, pages)
+
+        # save the fit results cache
+        if cache: _saveCache(cache)
+
+    # done
+    sproflib.Disable()
+    print(f"done ({len(files)+len(unmatched)-failed} converted, {failed} failed).")
+    return 1 if failed else 0
+
+version_history["0.0"] = """
+version 0.0
+(17 october 2026):
+
+    one command for the three layouts (page, document, plot), sharing
+    one import, fit and render pipeline, for globs and folders, with
+    worker processes, a fit results cache and an output option.
+
+        Files(paths[, pattern])
+        Sweep(fp[, entry][, fit])
+        Sweep.header()
+        Page(s)
+        Plot(sweeps)
+        main([args])
+"""
+
+version_history["0.1"] = """
+version 0.1
+(17 october 2026):
+
+    the folder watcher (scripts/fswpwatchtopdf.py) is the watch layout
+    of the command, on the same pipeline. The running document and the
+    summary table are continued from one session to the next and the
+    failed files are tried again.
+
+        Watch(folder[, output][, pattern][, interval][, settle]
+            [, existing][, retries][, cache])
+
+    Files() also returns the paths matching no file, reported as
+    failed by the command (exit status 1), and the plot layout reports
+    each file.
+"""
+
+#########
+# infos #
+#########
+
+if __name__ == "__main__":
+
+    _fp = "../.output/scmdlib.txt"
+    _fh = open(_fp, "w")
+    def lprint(*args, **kwargs):
+        print(*args, **kwargs)
+        kwargs["file"] = _fh
+        return print(*args, **kwargs)
+
+    ###  display version ###
+
+    current_version = list(version_history.keys())[-1]
+
+    lprint(f"scmdlib current version: {current_version}")
+    lprint(f"-------------------------")
+
+    lprint()
+    lprint(f"history")
+    lprint(f"-------")
+    for v in version_history.values():
+        lprint(v)
+
+    # test list
+    TESTS = [current_version]
+
+    #############
+    # tests 0.0 #
+    #############
+
+    if "0.0" in TESTS:
+
+        lprint("running test version 0.0")
+
+        from sys import executable
+        from time import perf_counter
+        from re import findall
+        from os import remove
+        from shutil import copy, rmtree
+        from subprocess import run, DEVNULL
+
+        # a batch of copies of the test sweeps
+        folder = "../.output/scmdlib"
+        if exists(folder): rmtree(folder)
+        makedirs(folder)
+        S = sorted(glob("../.data/*_full_*.dat"), key = _natural)
+        for i in range(4):
+            for a in S: copy(a, join(folder, f"B{i}_{basename(a)}"))
+        copy("../.data/fswp_full_1.dat", join(folder, "B9_full_1.dat"))
+
+        lprint()
+        lprint(f"files:")
+        lprint(f"------")
+        files, unmatched = Files([folder, f"{folder}/B0_*", S[0], f"{folder}/none_*"])
+        lprint(f"\t{len(files)} files: {[basename(a) for a in files[:3]]} ...")
+        lprint(f"\tunmatched: {unmatched}")
+
+        # the three layouts, serial and parallel
+        lprint()
+        lprint(f"layouts:")
+        lprint(f"--------")
+        for args in [
+                ["page", folder, "--no-cache", "--output", f"{folder}/pages"],
+                ["document", folder, "--no-cache", "--output", f"{folder}/serial.pdf"],
+                ["document", folder, "-j", "2", "--cache", f"{folder}/cache.json",
+                    "--output", f"{folder}/parallel.pdf", "--log"],
+                ["plot", f"{folder}/B0_*", "--sidecar", "--output", f"{folder}/plot.pdf"],
+                ]:
+            t = perf_counter()
+            code = main(args)
+            lprint(f"\t{' '.join(args[:1] + args[2:])}: exit {code}, {perf_counter()-t:.2f} s")
+
+        lprint(f"\tpages: {len(glob(f'{folder}/pages/*.pdf'))} files")
+        for fp in ["serial.pdf", "parallel.pdf", "plot.pdf"]:
+            data = open(join(folder, fp), "rb").read()
+            n = len(findall(rb"/Type\s*/Page[^s]", data))
+            lprint(f"\t{fp}: {n} pages, {len(data)/1E3:.1f} kB")
+        lprint(f"\tlog: {len(open(f'{folder}/parallel.jsonl').readlines())} lines")
+
+        # document layout against the number of worker processes (the
+        # scaling can only be seen with more than one core)
+        for j in sorted(set([1, 2, cpu_count()])):
+            t = perf_counter()
+            main(["document", folder, "--no-cache", "-j", f"{j}", "--output", f"{folder}/jobs.pdf"])
+            lprint(f"\tdocument -j {j}: {perf_counter()-t:.2f} s ({cpu_count()} cores)")
+        lprint(f"\tsidecars: {len(glob(f'{folder}/B0_*.bin'))} files")
+
+        # a failed file is reported, the batch goes on
+        open(join(folder, "B9_full_2.dat"), "w").close()
+        code = main(["page", join(folder, "B9_*"), "--no-cache", "--output", f"{folder}/pages"])
+        lprint(f"\tempty file: exit {code}")
+        code = main(["plot", f"{folder}/nonexistent.dat", "--output", f"{folder}/none.pdf"])
+        lprint(f"\tno file: exit {code}")
+        remove(join(folder, "B9_full_2.dat"))
+
+        # default fit results cache: next to the output
+        main(["page", f"{folder}/B0_*", "--output", f"{folder}/cached"])
+        lprint(f"\tdefault cache: {exists(join(folder, 'cached', 'fswp2pdf-cache.json'))}")
+
+        # one process for the batch, against one interpreter per file
+        lprint()
+        lprint(f"batch:")
+        lprint(f"------")
+        files, unmatched = Files([folder])
+        env = {"PYTHONPATH": "..", "MPLBACKEND": "Agg", "PATH": ""}
+        t = perf_counter()
+        run([executable, "-m", "fswp2pdf", "page", folder, "--no-cache",
+            "--output", f"{folder}/pages"], env = env, stdout = DEVNULL, check = True)
+        t1 = perf_counter()-t
+        t = perf_counter()
+        for a in files:
+            run([executable, "-m", "fswp2pdf", "page", a, "--no-cache",
+                "--output", f"{folder}/pages"], env = env, stdout = DEVNULL, check = True)
+        t2 = perf_counter()-t
+        lprint(f"\t{len(files)} files, one process  : {t1:.2f} s")
+        lprint(f"\t{len(files)} files, one per file : {t2:.2f} s")
+
+        rmtree(folder)
+
+    #############
+    # tests 0.1 #
+    #############
+
+    if "0.1" in TESTS:
+
+        lprint("running test version 0.1")
+
+        from sys import executable
+        from re import findall
+        from shutil import copy, rmtree
+        from signal import SIGINT
+        from os.path import abspath
+        from subprocess import Popen, PIPE
+
+        folder = "../.output/scmdlib-watch"
+        if exists(folder): rmtree(folder)
+        makedirs(folder)
+        S = sorted(glob("../.data/*_full_*.dat"), key = _natural)
+        wp = join(folder, "watch.pdf")
+
+        def session(*args, new = ()):
+            # run the watcher, drop new files in, stop it with Ctrl-C
+            P = Popen([executable, "-m", "fswp2pdf", "watch", abspath(folder),
+                "--no-cache", "--interval", "0.2", "--settle", "0.5", *args],
+                cwd = "..", env = {"PYTHONPATH": ".", "MPLBACKEND": "Agg", "PATH": ""},
+                stdout = PIPE, text = True)
+            sleep(2.0)
+            for a in new:
+                if isinstance(a, tuple):
+                    with open(a[0], "w") as fh: fh.write(a[1])
+                else:
+                    copy(a, folder)
+            sleep(6.0)
+            P.send_signal(SIGINT)
+            out = P.communicate()[0]
+            pages = len(findall(rb"/Type\s*/Page[^s]", open(wp, "rb").read()))
+            rows = len(sielib.import_FitSummary(wp[:-4]+"_.dat")["date"])
+            return out, pages, rows
+
+        lprint()
+        lprint(f"watch:")
+        lprint(f"------")
+
+        # files present at start up are skipped
+        copy(S[0], folder)
+        copy(S[1], folder)
+        out, pages, rows = session(new = [S[2], (join(folder, "bad_full_9.dat"), "x\n")])
+        lprint(f"\tfirst session : {pages} pages, {rows} rows, "
+            f"{out.count('failed')} failed attempts of the bad file")
+
+        # the running document is continued
+        out, pages, rows = session(new = [S[3]])
+        lprint(f"\tsecond session: {pages} pages, {rows} rows, "
+            f"temporary files left: {len(glob(join(folder, '*.tmp')))}")
+
+        # --existing: the files not yet in the summary table
+        out, pages, rows = session("--existing")
+        lprint(f"\t--existing    : {pages} pages, {rows} rows, "
+            f"{out.count('failed')} failed attempts of the bad file")
+
+        rmtree(folder)
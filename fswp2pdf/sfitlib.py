@@ -10,6 +10,11 @@ version_history = {}
     development of common fitting functions library for work.
 """
 
+# version of the fit model (functions, start parameters and fit method)
+# of LorentzFit(): bumped only when the fitted numbers change, the fit
+# results cache (sielib.FitCache) is keyed on it
+FIT_MODEL_VERSION = "0.4"
+
 # from package: "https://numpy.org/"
 # ----------------------------------
 
@@ -21,6 +26,44 @@ from numpy import flatnonzero
 from numpy import pi
 from numpy import cos
 from numpy import sin
+from numpy import column_stack
+from numpy import ones_like
+from numpy import zeros_like
+from numpy import concatenate
+from numpy import stack
+from numpy import array
+from numpy import asarray
+from numpy import full
+from numpy import empty
+from numpy import einsum
+from numpy import diagonal
+from numpy import arange
+from numpy import where
+from numpy import atleast_2d
+from numpy import broadcast_to
+from numpy import zeros
+from numpy import isfinite
+from numpy import nan
+from numpy.linalg import solve
+from numpy.linalg import matrix_rank
+from numpy.linalg import LinAlgError
+from numpy.linalg import pinv
+
+# From the local package
+# ----------------------
+try: # import from built
+    from fswp2pdf import sproflib
+except ImportError as error:
+    # local import
+    import sproflib
+
+# from package: "https://scipy.org/"
+# ----------------------------------
+
+# scipy.optimize is imported on first use only (import time)
+def curve_fit(*args, **kwargs):
+    from scipy.optimize import curve_fit
+    return curve_fit(*args, **kwargs)
 
 ##########################
 # Zero crossing function #
@@ -63,6 +106,291 @@ def LorentzDispersionFit_StartParameters(T, Y):
     al, ah = argmin(Y), argmax(Y)
     return [(T[al]+T[ah])/2.0, (T[al]-T[ah])/2.0, Y[ah]-Y[al], (Y[ah]+Y[al])/2.0]
 
+######################
+# analytic Jacobians #
+######################
+
+def LorentzAbsorptionFit_Jacobian(t, p, w, h, o):
+    # derivatives with respect to position, width, height, offset
+    # (written in place: one allocation per evaluation)
+    x = (t-p)/w
+    d = 1/(1+x*x)
+    J = empty(x.shape+(4,))
+    g = (2*h/w)*x*d*d
+    J[..., 0] = g
+    J[..., 1] = g*x
+    J[..., 2] = d
+    J[..., 3] = 1.0
+    return J
+
+def LorentzDispersionFit_Jacobian(t, p, w, h, o):
+    # derivatives with respect to position, width, height, offset
+    # (written in place: one allocation per evaluation)
+    x = (t-p)/w
+    d = 1/(1+x*x)
+    J = empty(x.shape+(4,))
+    g = (h/w)*(1-x*x)*d*d
+    J[..., 0] = g
+    J[..., 1] = g*x
+    J[..., 2] = -x*d
+    J[..., 3] = 1.0
+    return J
+
+def LorentzFit(T, X, Y):
+
+    """ 
+        fit both channels using the analytic Jacobians and return
+        (pAbs, pAbsCov, XF), (pDis, pDisCov, YF): the parameters,
+        the covariance matrix and the fitted curve of each channel.
+    """
+
+    with sproflib.Stage("fit", points = len(T)) as st:
+
+        pAbs = LorentzAbsorptionFit_Estimate(T, X)
+        pAbs, pAbsCov, iAbs, m, e = curve_fit(LorentzAbsorptionFit_Function, T, X, pAbs,
+            jac = LorentzAbsorptionFit_Jacobian, full_output = True)
+        XF = LorentzAbsorptionFit_Function(T, *pAbs)
+
+        pDis = LorentzDispersionFit_Estimate(T, Y)
+        pDis, pDisCov, iDis, m, e = curve_fit(LorentzDispersionFit_Function, T, Y, pDis,
+            jac = LorentzDispersionFit_Jacobian, full_output = True)
+        YF = LorentzDispersionFit_Function(T, *pDis)
+
+        # number of function evaluations (absorption, dispersion)
+        st.set(nfev = [int(iAbs["nfev"]), int(iDis["nfev"])])
+
+    return (pAbs, pAbsCov, XF), (pDis, pDisCov, YF)
+
+##############################
+# joint (complex) Lorentzian #
+##############################
+
+""" 
+    The absorption and the dispersion are the real and imaginary parts
+    of one complex Lorentzian: the position and the width are shared
+    between both channels, each channel has its own height and offset,
+    and a phase q rotates the response between the two channels (q = 0
+    gives back the absorption and dispersion functions above). The two
+    channels are stacked in a single array [X, Y] for the fit.
+"""
+
+def LorentzComplexFit_Function(t, p, w, hx, ox, hy, oy, q = 0.0):
+    # data, position, width, heights, offsets, phase
+    x = (t-p)/w
+    a = 1/(1+square(x))
+    d = x*a
+    u = a*cos(q) + d*sin(q)
+    v = d*cos(q) - a*sin(q)
+    return concatenate([ox + hx*u, oy - hy*v])
+
+def LorentzComplexFit_Jacobian(t, p, w, hx, ox, hy, oy, q = 0.0):
+    # derivatives with respect to p, w, hx, ox, hy, oy, q
+    x = (t-p)/w
+    a = 1/(1+square(x))
+    d = x*a
+    c, s = cos(q), sin(q)
+    u, v = a*c + d*s, d*c - a*s
+    # derivatives of u and v with respect to x
+    da, dd = -2*x*square(a), (1-square(x))*square(a)
+    du, dv = c*da + s*dd, c*dd - s*da
+    z, o = zeros_like(t), ones_like(t)
+    JX = column_stack([-hx*du/w, -hx*du*x/w,  u, o,  z, z, hx*v])
+    JY = column_stack([ hy*dv/w,  hy*dv*x/w,  z, z, -v, o, hy*u])
+    return concatenate([JX, JY])
+
+def LorentzComplexFit_StartParameters(T, X, Y):
+    p, w, hx, ox = LorentzAbsorptionFit_Estimate(T, X)
+    P, W, hy, oy = LorentzDispersionFit_Estimate(T, Y)
+    return [p, w, hx, ox, hy, oy, 0.0]
+
+def LorentzComplexFit(T, X, Y, phase = True):
+
+    """ 
+        fit both channels jointly and return (P, C, XF, YF): the
+        parameters [p, w, hx, ox, hy, oy(, q)], the covariance matrix
+        and the fitted curves. With phase = False, the phase is fixed
+        to zero and only the first six parameters are fitted.
+    """
+
+    n = 7 if phase else 6
+    P = LorentzComplexFit_StartParameters(T, X, Y)[:n]
+    P, C = curve_fit(
+        lambda t, *P: LorentzComplexFit_Function(t, *P),
+        T, concatenate([X, Y]), P,
+        jac = lambda t, *P: LorentzComplexFit_Jacobian(t, *P)[:, :n])
+    XY = LorentzComplexFit_Function(T, *P)
+    return P, C, XY[:T.size], XY[T.size:]
+
+#################
+# batch fitting #
+#################
+
+""" 
+    Many sweeps are fitted at once with a vectorized Levenberg-Marquardt
+    algorithm: the sweeps are the rows of a 2-D array and the parameters
+    of each sweep are passed to the model functions as columns, so that
+    numpy broadcasting evaluates all the sweeps in one call. The model
+    functions and Jacobians above are written to support this.
+"""
+
+def BatchFit(function, jacobian, T, X, P,
+        iterations  =   100,    # maximum number of iterations
+        tolerance   =   1E-10,  # relative decrease of the residuals
+        full_output =   False,  # also return the converged flags
+        ):
+
+    """ 
+        fit the rows of X (M sweeps of N points) against the rows of T
+        (or against a common 1-D array T) with the start parameters P
+        (M rows of k parameters). Return the parameters (M, k) and the
+        covariance matrices (M, k, k), computed as curve_fit() does.
+        With full_output = True, also return the converged flag of each
+        sweep. A sweep that cannot be fitted (non finite data, singular
+        normal equations: a flat sweep for example) is not converged,
+        keeps its last parameters and gets a NaN covariance matrix: the
+        other sweeps are fitted normally.
+    """
+
+    X = array(X, float)
+    T = array(T, float)
+    P = array(P, float)
+    M, N = X.shape
+    T = T.reshape(-1, N)
+    k = P.shape[1]
+
+    def model(i, P): return function(T[i % T.shape[0]], *P.T[:, :, None])
+    def jac(i, P): return jacobian(T[i % T.shape[0]], *P.T[:, :, None])
+
+    with sproflib.Stage("batch fit", function = function.__name__, sweeps = M, points = N) as st:
+
+        # initial residuals
+        I = arange(M)
+        R = X - model(I, P)
+        S = (R*R).sum(axis = 1)
+        L = full(M, 1E-3)
+        converged = zeros(M, bool)
+        failed = ~isfinite(S)
+        I = I[~failed]
+
+        n = 0
+        for n in range(1, iterations+1):
+            if not I.size: break
+            # normal equations with Marquardt's diagonal scaling
+            J = jac(I, P[I])
+            A = einsum("mni,mnj->mij", J, J)
+            g = einsum("mni,mn->mi", J, R[I])
+            D = diagonal(A, axis1 = 1, axis2 = 2)
+            A[:, range(k), range(k)] += L[I, None]*D
+            # drop the sweeps that cannot be solved (one at a time)
+            bad = ~(isfinite(A).all(axis = (1, 2)) & isfinite(g).all(axis = 1))
+            try:
+                dP = solve(A[~bad], g[~bad, :, None])[:, :, 0]
+            except LinAlgError:
+                bad[~bad] = matrix_rank(A[~bad]) < k
+                dP = solve(A[~bad], g[~bad, :, None])[:, :, 0]
+            failed[I[bad]] = True
+            I = I[~bad]
+            if not I.size: break
+            # trial step
+            Q = P[I] + dP
+            r = X[I] - model(I, Q)
+            s = (r*r).sum(axis = 1)
+            # accept or reject the step of each sweep
+            a = s < S[I]
+            done = a & (S[I]-s <= tolerance*S[I])
+            P[I[a]], R[I[a]], S[I[a]] = Q[a], r[a], s[a]
+            L[I] = L[I]*(a*0.1 + ~a*10.0)
+            converged[I[done]] = True
+            # keep iterating the sweeps that are still improving
+            I = I[~done & (L[I] < 1E10)]
+
+        # iterations and sweeps not converged
+        st.set(iterations = n, unconverged = int(M - converged.sum()),
+            failed = int(failed.sum()))
+
+        # covariance matrices (of the sweeps that could be solved)
+        C = full((M, k, k), nan)
+        I = flatnonzero(~failed)
+        if I.size:
+            J = jac(I, P[I])
+            C[I] = pinv(einsum("mni,mnj->mij", J, J))*(S[I]/max(N-k, 1))[:, None, None]
+
+    # done
+    if full_output: return P, C, converged
+    return P, C
+
+def LorentzBatchFit(T, X, Y, full_output = False):
+
+    """ 
+        fit the rows of X and Y (M sweeps) and return (PA, CA), (PD, CD):
+        the parameters (M, 4) and the covariance matrices (M, 4, 4) of the
+        absorption and of the dispersion (with full_output = True, also
+        the converged flags: (PA, CA, cA), (PD, CD, cD)).
+    """
+
+    PA = LorentzAbsorptionFit_Estimate(T, X)
+    PD = LorentzDispersionFit_Estimate(T, Y)
+    A = BatchFit(LorentzAbsorptionFit_Function, LorentzAbsorptionFit_Jacobian, T, X, PA,
+        full_output = full_output)
+    D = BatchFit(LorentzDispersionFit_Function, LorentzDispersionFit_Jacobian, T, Y, PD,
+        full_output = full_output)
+    return A, D
+
+###############################
+# vectorized start parameters #
+###############################
+
+""" 
+    The estimators below accept one sweep (1-D arrays) or a stack of
+    sweeps (2-D arrays, one sweep per row, with T either 1-D or 2-D).
+    The half maximum crossings are interpolated linearly between samples
+    and a truncated peak (a crossing outside of the window) falls back
+    on the crossing that is found, or on a quarter of the window.
+"""
+
+def _rows(T, X):
+    X = atleast_2d(X)
+    T = broadcast_to(T, X.shape)
+    return T, X
+
+def LorentzAbsorptionFit_Estimate(T, X):
+    T, X = asarray(T, float), asarray(X, float)
+    s = X.ndim
+    T, X = _rows(T, X)
+    M, N = X.shape
+    r, I = arange(M), arange(N)
+    al, ah = X.argmin(axis = 1), X.argmax(axis = 1)
+    o, tp = X[r, al], T[r, ah]
+    h = X[r, ah] - o
+    c = o + h/2.0
+    # last (first) sample below half maximum on the left (right) of the peak
+    B = X < c[:, None]
+    il = where(B & (I < ah[:, None]), I, -1).max(axis = 1)
+    ir = where(B & (I > ah[:, None]), I, N).min(axis = 1)
+    fl, fr = il >= 0, ir < N
+    # interpolate both crossings between samples i and i+1
+    i = stack([il, ir-1]).clip(0, N-2)
+    xi, xj, ti, tj = X[r, i], X[r, i+1], T[r, i], T[r, i+1]
+    tl, tr = ti + (c - xi)*(tj - ti)/where(xj == xi, 1.0, xj - xi)
+    # width and position with fall backs for truncated peaks
+    w = where(fl & fr, (tr - tl)/2.0,
+        where(fl, tp - tl,
+        where(fr, tr - tp, (T[:, -1] - T[:, 0])/4.0)))
+    p = where(fl & fr, (tl + tr)/2.0, tp)
+    P = stack([p, abs(w), h, o], axis = -1)
+    return P if s > 1 else P[0]
+
+def LorentzDispersionFit_Estimate(T, Y):
+    T, Y = asarray(T, float), asarray(Y, float)
+    s = Y.ndim
+    T, Y = _rows(T, Y)
+    r = arange(Y.shape[0])
+    al, ah = Y.argmin(axis = 1), Y.argmax(axis = 1)
+    yl, yh = Y[r, al], Y[r, ah]
+    tl, th = T[r, al], T[r, ah]
+    P = stack([(tl+th)/2.0, (tl-th)/2.0, yh-yl, (yh+yl)/2.0], axis = -1)
+    return P if s > 1 else P[0]
+
 def LorentzFitParametersDisplay(pAbs, pDis):
     # import formatting function for plot display
     try: # import from built
@@ -92,6 +420,59 @@ def LorentzFitParametersDisplay(pAbs, pDis):
     # done
     return block
 
+def LorentzComplexFitParametersDisplay(P):
+    # import formatting function for plot display
+    try: # import from built
+        from fswp2pdf.splotlib import GetUnitPrefix
+    except ImportError as error:
+        # local import
+        from splotlib import GetUnitPrefix
+    # collect parameters explicitly
+    p, w, H1, O1, H2, O2 = P[:6]
+    q = P[6] if len(P) > 6 else 0.0
+    # engineer units formatting
+    P_f,  P_p = GetUnitPrefix([p])
+    W_f,  W_p = GetUnitPrefix([w])
+    H_f,  H_p = GetUnitPrefix([H1, H2])
+    O_f,  O_p = GetUnitPrefix([O1, O2])
+    # output text
+    block = f"""
+                 Absorption, Dispersion
+
+        position: {p*P_f:7.3f}{P_p+'Hz':<2}
+        width   : {w*W_f:6.2f}{W_p+'Hz':<3}
+        height  : {H1*H_f:6.2f}{H_p+ 'V':<3}, {H2*H_f:6.2f}{H_p+ 'V':<3}
+        offset  : {O1*O_f:6.2f}{O_p+ 'V':<3}, {O2*O_f:6.2f}{O_p+ 'V':<3}
+        phase   : {q*180/pi:6.2f}deg
+        """
+    # done
+    return block
+
+def LorentzFitTableDisplay(infos, PA, PD):
+    # import formatting functions for plot display
+    try: # import from built
+        from fswp2pdf.splotlib import GetUnitPrefix, FormatTable
+    except ImportError as error:
+        # local import
+        from splotlib import GetUnitPrefix, FormatTable
+    # one row of parameters per sweep
+    PA, PD = atleast_2d(PA), atleast_2d(PD)
+    # engineer units formatting (one prefix per column pair)
+    header, columns = ["file", "time"], []
+    for i, (name, unit, f) in enumerate([
+            ("position", "Hz", "8.3f"),
+            ("width",    "Hz", "6.2f"),
+            ("height",   "V",  "6.2f"),
+            ("offset",   "V",  "6.2f")]):
+        k, p = GetUnitPrefix(PA[:, i], PD[:, i])
+        header += [f"{name}/{p}{unit}", "(disp.)"]
+        columns += [[f"{v*k:{f}}" for v in PA[:, i]],
+                    [f"{v*k:{f}}" for v in PD[:, i]]]
+    rows = [[info["filenum"], info["time"]] for info in infos]
+    rows = [r+list(c) for r, c in zip(rows, zip(*columns))]
+    # done
+    return FormatTable(rows, header)
+
 version_history["0.0"] = """
 version 0.0 (11 January 2025)
 
@@ -114,6 +495,91 @@ version 0.0 (11 January 2025)
 
 """
 
+version_history["0.1"] = """
+version 0.1 (17 October 2026)
+
+    add analytic Jacobians and a single call fit of both channels:
+
+        - Jacobians:
+            LorentzAbsorptionFit_Jacobian()
+            LorentzDispersionFit_Jacobian()
+
+        - fit both channels:
+            LorentzFit()
+
+"""
+
+version_history["0.2"] = """
+version 0.2 (17 October 2026)
+
+    add a joint fit of both channels (one complex Lorentzian) with a
+    shared position and width, a height and an offset per channel and
+    an optional phase:
+
+        LorentzComplexFit_Function()
+        LorentzComplexFit_Jacobian()
+        LorentzComplexFit_StartParameters()
+        LorentzComplexFit()
+        LorentzComplexFitParametersDisplay()
+
+"""
+
+version_history["0.3"] = """
+version 0.3 (17 October 2026)
+
+    add batch fitting of many sweeps in one vectorized
+    Levenberg-Marquardt problem:
+
+        BatchFit()
+        LorentzBatchFit()
+
+    the Jacobians support broadcasting (parameters as columns).
+
+"""
+
+version_history["0.4"] = """
+version 0.4 (17 October 2026)
+
+    add vectorized start parameters estimators, for one sweep or for a
+    stack of sweeps, with interpolated half maximum crossings and fall
+    backs for truncated peaks:
+
+        LorentzAbsorptionFit_Estimate()
+        LorentzDispersionFit_Estimate()
+
+    LorentzFit(), LorentzComplexFit() and LorentzBatchFit() use them.
+
+"""
+
+version_history["0.5"] = """
+version 0.5 (17 October 2026)
+
+    scipy.optimize is imported on the first call of curve_fit() only.
+
+"""
+
+version_history["0.6"] = """
+version 0.6 (17 October 2026)
+
+    add a table of the fit results of many sweeps (one row per sweep,
+    absorption and dispersion columns) for a summary page:
+
+        LorentzFitTableDisplay()
+
+"""
+
+version_history["0.7"] = """
+version 0.7 (17 October 2026)
+
+    LorentzFit() and BatchFit() are recorded as stages by sproflib when
+    enabled, with the number of function evaluations of each channel
+    and the number of iterations of the batch.
+
+    FIT_MODEL_VERSION: the version of the fit model and of its results
+    (the fit results cache key), independent of the module version.
+
+"""
+
 #####################
 # further functions #
 #####################
@@ -234,6 +700,283 @@ if __name__ == "__main__":
         # update document
         doc.updatefile()
 
+    #############
+    # tests 0.1 #
+    #############
+
+    if "0.1" in TESTS:
+
+        lprint("running test version 0.1")
+
+        from time import perf_counter
+        from numpy import sqrt, diag, allclose, errstate
+
+        import sielib
+
+        lprint()
+        lprint(f"finite differences vs analytic Jacobians:")
+        lprint(f"-----------------------------------------")
+
+        for fp in [
+            "../.data/fswp_full_1.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_21.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_22.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_23.dat",
+            ]:
+
+            info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+            T, F, X, Y = data
+
+            # count model evaluations (finite differences, as in the scripts)
+            p0 = LorentzAbsorptionFit_StartParameters(F, X)
+            p1, c1, i1, m, e = curve_fit(LorentzAbsorptionFit_Function, F, X, p0, full_output = True)
+            q0 = LorentzDispersionFit_StartParameters(F, Y)
+            q1, d1, j1, m, e = curve_fit(LorentzDispersionFit_Function, F, Y, q0, full_output = True)
+
+            # count model evaluations (analytic Jacobians)
+            p2, c2, i2, m, e = curve_fit(LorentzAbsorptionFit_Function, F, X, p0, full_output = True,
+                jac = LorentzAbsorptionFit_Jacobian)
+            q2, d2, j2, m, e = curve_fit(LorentzDispersionFit_Function, F, Y, q0, full_output = True,
+                jac = LorentzDispersionFit_Jacobian)
+
+            # timing (same start parameters, the fits only)
+            N = 50
+            t0 = perf_counter()
+            for i in range(N):
+                curve_fit(LorentzAbsorptionFit_Function, F, X, p0)
+                curve_fit(LorentzDispersionFit_Function, F, Y, q0)
+            t1 = perf_counter()
+            for i in range(N):
+                curve_fit(LorentzAbsorptionFit_Function, F, X, p0, jac = LorentzAbsorptionFit_Jacobian)
+                curve_fit(LorentzDispersionFit_Function, F, Y, q0, jac = LorentzDispersionFit_Jacobian)
+            t2 = perf_counter()
+            # LorentzFit(): start parameters, fits and fitted curves
+            for i in range(N):
+                LorentzFit(F, X, Y)
+            t3 = perf_counter()
+
+            # parameter differences relative to the parameter errors
+            dp = max(abs(p1-p2)/sqrt(diag(c1)))
+            dq = max(abs(q1-q2)/sqrt(diag(d1)))
+
+            lprint()
+            lprint(f"\t{info['filename']}")
+            lprint(f"\tevaluations : {i1['nfev']+j1['nfev']:5} (finite), {i2['nfev']+j2['nfev']:5} (analytic)")
+            lprint(f"\twall time   : {(t1-t0)/N*1E3:5.2f} ms (finite), {(t2-t1)/N*1E3:5.2f} ms (analytic)")
+            lprint(f"\tLorentzFit  : {(t3-t2)/N*1E3:5.2f} ms")
+            lprint(f"\tparameters  : max difference {max(dp, dq):.1e} sigma")
+
+    #############
+    # tests 0.2 #
+    #############
+
+    if "0.2" in TESTS:
+
+        lprint("running test version 0.2")
+
+        from numpy import sqrt, diag, allclose, errstate
+
+        import sielib
+
+        lprint()
+        lprint(f"separate fits vs joint fit:")
+        lprint(f"---------------------------")
+
+        for fp in [
+            "../.data/fswp_full_1.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_21.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_22.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_23.dat",
+            ]:
+
+            info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+            T, F, X, Y = data
+
+            (pAbs, cAbs, XF), (pDis, cDis, YF) = LorentzFit(F, X, Y)
+            P, C, XF, YF = LorentzComplexFit(F, X, Y)
+            E = sqrt(diag(C))
+
+            lprint()
+            lprint(f"\t{info['filename']}")
+            lprint(f"\tposition : {pAbs[0]:.5f}, {pDis[0]:.5f} (separate), {P[0]:.5f} +- {E[0]:.1e} (joint)")
+            lprint(f"\twidth    : {pAbs[1]:.5f}, {pDis[1]:.5f} (separate), {P[1]:.5f} +- {E[1]:.1e} (joint)")
+            lprint(f"\tphase    : {P[6]*180/pi:.3f} +- {E[6]*180/pi:.3f} deg")
+
+        lprint(LorentzComplexFitParametersDisplay(P))
+
+    #############
+    # tests 0.3 #
+    #############
+
+    if "0.3" in TESTS:
+
+        lprint("running test version 0.3")
+
+        from time import perf_counter
+        from numpy import sqrt, diag, allclose, errstate
+        from numpy.random import default_rng
+
+        import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        # stack of noisy copies of the same sweep
+        M = 500
+        rng = default_rng(0)
+        XS = X + rng.normal(0.0, 3E-6, (M, X.size))
+        YS = Y + rng.normal(0.0, 3E-6, (M, Y.size))
+
+        t0 = perf_counter()
+        R = [LorentzFit(F, x, y) for x, y in zip(XS, YS)]
+        t1 = perf_counter()
+        (PA, CA), (PD, CD) = LorentzBatchFit(F, XS, YS)
+        t2 = perf_counter()
+
+        # parameter differences relative to the parameter errors
+        dp = max(max(abs(PA[i]-a[0])/sqrt(diag(a[1]))) for i, (a, d) in enumerate(R))
+        dq = max(max(abs(PD[i]-d[0])/sqrt(diag(d[1]))) for i, (a, d) in enumerate(R))
+
+        lprint()
+        lprint(f"benchmark:")
+        lprint(f"----------")
+        lprint(f"\t{M} sweeps of {F.size} points")
+        lprint(f"\tcurve_fit loop : {M/(t1-t0):8.0f} sweeps/s")
+        lprint(f"\tbatch fit      : {M/(t2-t1):8.0f} sweeps/s")
+        lprint(f"\tparameters     : max difference {max(dp, dq):.1e} sigma")
+
+        # no iteration: the start parameters are returned
+        import sproflib
+        sproflib.Enable()
+        P0 = LorentzAbsorptionFit_Estimate(F, XS)
+        P, C = BatchFit(LorentzAbsorptionFit_Function, LorentzAbsorptionFit_Jacobian, F, XS, P0, iterations = 0)
+        r = sproflib.Records()[-1]
+        sproflib.Disable()
+        lprint(f"\tno iteration   : {(P == P0).all()}, {r['iterations']} iterations recorded")
+
+        # one flat sweep and one sweep with a NaN point in the stack
+        XB, YB = XS[:10].copy(), YS[:10].copy()
+        XB[3], YB[3] = 1E-5, 1E-5
+        XB[7, 50], YB[7, 50] = nan, nan
+        with errstate(all = "ignore"):
+            (PA, CA, cA), (PD, CD, cD) = LorentzBatchFit(F, XB, YB, full_output = True)
+        (PA0, CA0), (PD0, CD0) = LorentzBatchFit(F, XS[:10], YS[:10])
+        lprint(f"\tbad sweeps     : converged {cA.astype(int).tolist()} {cD.astype(int).tolist()}")
+        lprint(f"\t                 other sweeps unchanged {allclose(PA[cA], PA0[cA]) and allclose(PD[cD], PD0[cD])}")
+
+    #############
+    # tests 0.4 #
+    #############
+
+    if "0.4" in TESTS:
+
+        lprint("running test version 0.4")
+
+        from time import perf_counter
+        from numpy.random import default_rng
+
+        import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        def nfev(p0):
+            r = curve_fit(LorentzAbsorptionFit_Function, F, X, p0, full_output = True,
+                jac = LorentzAbsorptionFit_Jacobian)
+            return r[2]["nfev"]
+
+        def fmt(P): return ", ".join(f"{v:.6g}" for v in P)
+
+        lprint()
+        lprint(f"start parameters:")
+        lprint(f"-----------------")
+        lprint(f"\tprevious  : {fmt(LorentzAbsorptionFit_StartParameters(F, X))}")
+        lprint(f"\testimate  : {fmt(LorentzAbsorptionFit_Estimate(F, X))}")
+        lprint(f"\tfit       : {fmt(LorentzFit(F, X, Y)[0][0])}")
+        lprint(f"\titerations: {nfev(LorentzAbsorptionFit_StartParameters(F, X))} (previous), {nfev(LorentzAbsorptionFit_Estimate(F, X))} (estimate)")
+
+        # truncated peak: the window stops before the right crossing
+        n = X.argmax() + 3
+        lprint()
+        lprint(f"truncated peak:")
+        lprint(f"---------------")
+        try:
+            LorentzAbsorptionFit_StartParameters(F[:n], X[:n])
+            lprint(f"\tprevious  : no error")
+        except IndexError as error:
+            lprint(f"\tprevious  : IndexError")
+        lprint(f"\testimate  : {fmt(LorentzAbsorptionFit_Estimate(F[:n], X[:n]))}")
+
+        # lists are accepted as well as arrays
+        lprint()
+        lprint(f"list input:")
+        lprint(f"-----------")
+        lprint(f"\tabsorption: {(LorentzAbsorptionFit_Estimate(list(F), list(X)) == LorentzAbsorptionFit_Estimate(F, X)).all()}")
+        lprint(f"\tdispersion: {(LorentzDispersionFit_Estimate(list(F), list(Y)) == LorentzDispersionFit_Estimate(F, Y)).all()}")
+
+        # stack of sweeps
+        M = 1000
+        rng = default_rng(0)
+        XS = X + rng.normal(0.0, 3E-6, (M, X.size))
+        t0 = perf_counter()
+        P1 = [LorentzAbsorptionFit_StartParameters(F, x) for x in XS]
+        t1 = perf_counter()
+        P2 = LorentzAbsorptionFit_Estimate(F, XS)
+        t2 = perf_counter()
+
+        lprint()
+        lprint(f"benchmark:")
+        lprint(f"----------")
+        lprint(f"\t{M} sweeps of {F.size} points")
+        lprint(f"\tprevious (loop) : {M/(t1-t0):10.0f} sweeps/s")
+        lprint(f"\testimate (2-D)  : {M/(t2-t1):10.0f} sweeps/s")
+
+    #############
+    # tests 0.6 #
+    #############
+
+    if "0.6" in TESTS:
+
+        lprint("running test version 0.6")
+
+        from time import perf_counter
+        from numpy.random import default_rng
+
+        import sielib
+        import splotlib
+
+        fp = "../.data/fswp_full_1.dat"
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        # fit results of a stack of sweeps
+        M = 80
+        rng = default_rng(0)
+        XS = X + rng.normal(0.0, 3E-6, (M, X.size))
+        YS = Y + rng.normal(0.0, 3E-6, (M, Y.size))
+        (PA, CA), (PD, CD) = LorentzBatchFit(F, XS, YS)
+        infos = [dict(info, filenum = i+1) for i in range(M)]
+
+        # one page table
+        t0 = perf_counter()
+        table = LorentzFitTableDisplay(infos, PA, PD)
+        t1 = perf_counter()
+        fg, ax = splotlib.MakeFigure(border = 5.0)
+        ax.set_axis_off()
+        with splotlib.Handles(fg, ax):
+            splotlib.Text(table, "center", fontsize = "xx-small")
+        splotlib.CatPages("../.output/sfitlib-table.pdf", [splotlib.RenderPage(fg)])
+        t2 = perf_counter()
+
+        lprint()
+        lprint(f"fit results table:")
+        lprint(f"------------------")
+        lprint("\n".join(table.split("\n")[:5]))
+        lprint(f"\t...")
+        lprint(f"\t{M} sweeps: table {(t1-t0)*1E3:.1f} ms, page {(t2-t1)*1E3:.1f} ms")
+
     #############
     # tests x.x #
     #############
@@ -12,17 +12,72 @@ version_history = {}
     
 """
 
+# built-in imports
+# ----------------
+from os import stat
+from os import replace
+from os import remove
+from os.path import exists
+from struct import pack, unpack
+from json import dumps, loads, dump, load
+from time import time as now
+from hashlib import sha1
+from re import match
 
 # From "https://numpy.org/"
 # -------------------------
-from numpy import loadtxt
+from numpy import array
+from numpy import fromstring
+from numpy import atleast_2d
+from numpy import atleast_1d
+from numpy import full
+from numpy import nan
+from numpy import memmap
+from numpy import ascontiguousarray
+
+# From the local package
+# ----------------------
+try: # import from built
+    from fswp2pdf import sproflib
+except ImportError as error:
+    # local import
+    import sproflib
+
+#######################
+# header line parsing #
+#######################
+
+def _seconds(s):
+    # "hh:mm:ss" to seconds
+    t =  float(s[0:2])*3600
+    t += float(s[3:5])*60
+    t += float(s[6: ])*1
+    return t
+
+def _parseFreqScanHeader(tx, fp):
+
+    """ build the info dictionary from the "% Fsweep" header line """
+
+    file, date, time, drive, dvm = tx.split("\t")
+
+    info = {
+        "filename"  :   fp.replace(chr(92), chr(47)).split("/")[-1],
+        "filenum"   :   int(file[9:].split()[0]),
+        "date"      :   date,
+        "time"      :   time,
+        "seconds"   :   _seconds(time),
+        "drive"     :   float(drive.split(" ")[-1])*1E-3,
+        "dvm"       :   float(dvm.split()[-1]),
+        }
+
+    return info
 
 
 ##################################################
 # import_TorsionOscilla_FreqScan_20241213_112400 #
 ##################################################
 
-def import_TorsionOscilla_FreqScan_20241213_112400(fp):
+def import_TorsionOscilla_FreqScan_20241213_112400(fp, sidecar = False):
 
     r"""
     created: 2024/12/13 at 11:24:00
@@ -36,52 +91,512 @@ def import_TorsionOscilla_FreqScan_20241213_112400(fp):
     8.8000000000E+1 1.8358300000E-5 3.8731300000E-4 3.8166019067E+9
     8.8007070707E+1 1.8656400000E-5 3.8957800000E-4 3.8166019098E+9
     <--
+
+    with sidecar = True, the data is read back from the binary sidecar
+    file (see below), which is written on the first import and after
+    any change of the data file.
     """
 
-    fh = open(fp, "r")
-    tx = fh.readline()
-    fh.close()
+    with sproflib.Stage("import", file = fp, sidecar = sidecar) as st:
+        info, data = _readFreqScan(fp, sidecar)
+        st.set(points = data.shape[1])
+
+    return info, _sweepColumns(data)
+
+def _readFreqScan(fp, sidecar = False):
+    # return the info and the raw columns freq, Vx, Vy, time (4 rows)
+    r = _readSidecar(fp) if sidecar else None
+    if r is None:
+        # single pass: header line, column names, then the numeric block
+        with open(fp, "r") as fh:
+            info = _parseFreqScanHeader(fh.readline(), fp)
+            fh.readline()
+            data = _parseFreqScanData(fh.read())
+        if sidecar: _writeSidecar(fp, info, data)
+        r = info, data
+    return r
+
+def _parseFreqScanData(tx):
+    # numeric block to 4 rows (the "%" comment lines are skipped, as
+    # numpy.loadtxt did, the fast path is taken when there is none)
+    if "%" in tx:
+        tx = "\n".join([l for l in tx.split("\n") if not l.lstrip().startswith("%")])
+    return fromstring(tx, sep = " ").reshape(-1, 4).T
+
+def _sweepColumns(data):
+    # elapsed time, frequency, absorption and dispersion
+    T  = data[3] - data[3, 0]
+    F  = data[0]
+    X  = data[1]
+    Y  = data[2]
+    return T, F, X, Y
+
+##################
+# binary sidecar #
+##################
 
-    file, date, time, drive, dvm = tx.split("\t")
+""" 
+    The sidecar file (data file name + ".bin") holds an imported sweep:
+    an 8 bytes tag, the header length (unsigned 64 bits integer), a json
+    header (the info dictionary, the number of rows, the modification
+    time and the size of the data file) padded to a multiple of 8 bytes,
+    then the four float64 columns freq, Vx, Vy, time one after the other.
+    The columns are read back with numpy.memmap (copy-on-write, so that
+    in place scaling of the arrays does not modify the sidecar file).
+"""
 
-    def seconds(s):
-        t =  float(s[0:2])*3600
-        t += float(s[3:5])*60
-        t += float(s[6: ])*1
-        return t
+_SweepTag = b"FSWPBIN1"
+
+def _packSweep(header, data):
+    # tag, header length, json header (padded), float64 columns
+    header = dumps(header).encode()
+    header += b" "*(-len(header) % 8)
+    data = ascontiguousarray(data, dtype = "<f8")
+    return _SweepTag + pack("<Q", len(header)) + header + data.tobytes()
+
+def _readSweepHeader(fh):
+    # return the header and the offset of the columns (or None)
+    b = fh.read(16)
+    if len(b) < 16 or b[:8] != _SweepTag: return None
+    n, = unpack("<Q", b[8:])
+    header = loads(fh.read(n))
+    return header, fh.tell()
+
+def _writeSidecar(fp, info, data):
+    st = stat(fp)
+    header = {
+        "info"  :   info,
+        "rows"  :   data.shape[1],
+        "mtime" :   st.st_mtime_ns,
+        "size"  :   st.st_size,
+        }
+    try:
+        # write a temporary file then replace the sidecar (an interrupted
+        # write never leaves a partial sidecar)
+        with open(fp+".bin.tmp", "wb") as fh:
+            fh.write(_packSweep(header, data))
+        replace(fp+".bin.tmp", fp+".bin")
+    except OSError:
+        # the sidecar is optional (read-only folder for example)
+        pass
+    return
+
+def _readSidecar(fp):
+    # return None when the sidecar is missing, invalid or stale
+    try:
+        st = stat(fp)
+        size = stat(fp+".bin").st_size
+        with open(fp+".bin", "rb") as fh:
+            r = _readSweepHeader(fh)
+    except (OSError, ValueError):
+        return None
+    if r is None: return None
+    header, offset = r
+    if header["mtime"] != st.st_mtime_ns or header["size"] != st.st_size:
+        return None
+    # truncated sidecar
+    if offset + 32*header["rows"] > size:
+        return None
+    data = memmap(fp+".bin", dtype = "<f8", mode = "c",
+        offset = offset, shape = (4, header["rows"]))
+    return header["info"], data
+
+#################
+# sweep archive #
+#################
+
+class SweepArchive():
+
+    """ 
+
+        SweepArchive(pathname) is a single file holding all the sweeps of
+        a run. Each sweep is appended as one record with the same layout
+        as a sidecar file (tag, json header with the info dictionary,
+        float64 columns). The index (sweep number to record offset) is
+        rebuilt on instantiation by reading the record headers only, then
+        any sweep is loaded with one numpy.memmap:
+
+        archive = SweepArchive("run.fsa")
+        archive.add(fp)
+        info, (T, F, X, Y) = archive.load(21)
+        archive.find(date = "11/12/2024", drive = 7.0)
+
+        A truncated last record (interrupted write) is ignored and is
+        overwritten by the next append.
 
-    info = {
-        "filename"  :   fp.replace(chr(92), chr(47)).split("/")[-1],
-        "filenum"   :   int(file[9:].split()[0]),
-        "date"      :   date,
-        "time"      :   time,
-        "seconds"   :   seconds(time),
-        "drive"     :   float(drive.split(" ")[-1])*1E-3,
+    """
+
+    def __init__(self, pathname):
+        self.pathname = pathname
+        self.sweeps = {}    # sweep number: (offset, rows, info)
+        self.end = 0        # end of the last valid record
+        if exists(pathname):
+            size = stat(pathname).st_size
+            with open(pathname, "rb") as fh:
+                while True:
+                    try:
+                        r = _readSweepHeader(fh)
+                    except ValueError:
+                        r = None
+                    if r is None: break
+                    header, offset = r
+                    end = offset + 32*header["rows"]
+                    if end > size: break
+                    self.sweeps[header["info"]["filenum"]] = (
+                        offset, header["rows"], header["info"])
+                    fh.seek(end)
+                    self.end = end
+        return
+
+    def __len__(self):
+        return len(self.sweeps)
+
+    def __contains__(self, filenum):
+        return filenum in self.sweeps
+
+    def append(self, info, data):
+        # append only: a sweep number is never overwritten
+        if info["filenum"] in self.sweeps: return False
+        record = _packSweep({"info": info, "rows": data.shape[1]}, data)
+        with open(self.pathname, "r+b" if exists(self.pathname) else "wb") as fh:
+            fh.seek(self.end)
+            fh.truncate()
+            fh.write(record)
+        self.sweeps[info["filenum"]] = (
+            self.end + len(record) - 32*data.shape[1], data.shape[1], info)
+        self.end += len(record)
+        return True
+
+    def add(self, fp):
+        # import a data file and append it
+        info, data = _readFreqScan(fp)
+        return self.append(info, data)
+
+    def load(self, filenum):
+        offset, rows, info = self.sweeps[filenum]
+        data = memmap(self.pathname, dtype = "<f8", mode = "c",
+            offset = offset, shape = (4, rows))
+        return dict(info), _sweepColumns(data)
+
+    def find(self, date = None, time = None, drive = None):
+        # sweep numbers matching the date, time and drive given
+        N = []
+        for n, (offset, rows, info) in sorted(self.sweeps.items()):
+            if date is not None and info["date"] != date: continue
+            if time is not None and info["time"] != time: continue
+            if drive is not None and abs(info["drive"] - drive) > 1E-9: continue
+            N.append(n)
+        return N
+
+#################
+# summary table #
+#################
+
+""" 
+    The summary table ("_.dat" file of a run, next to its sweep files)
+    has one row per sweep, tab separated, without header: the date, the
+    time, the instrument reading of the acquisition program, then the
+    fit results of the absorption: full width at half maximum (FWHM),
+    position, FWHM x height / drive (in 1E-6), norm of the residuals,
+    offset (in 1E-9 V), the dvm reading, the height of the dispersion
+    (in 1E-9 V), then the fit results of the dispersion: FWHM, position,
+    FWHM x height / drive (in 1E-6), norm of the residuals and offset
+    (in 1E-9 V). Rows are appended as the sweeps are fitted, old sweeps
+    are never re-fitted.
+
+    The ".tat" files written by the acquisition program have another
+    layout (the sweep log): the instrument settings, a blank line, then
+    one line per sweep, "sweep 20  at:<tab>11/12/2024<tab>16:16:09".
+    import_FitSummary() reads both layouts, export_SweepLog() writes
+    the sweep log back.
+"""
+
+def _sci(v, sign = "-"):
+    # acquisition program format: "6.1652E+0", "9.9559E-2"
+    if v != v: return "NaN"
+    m, e = f"{v:{sign}.4E}".split("E")
+    return f"{m}E{int(e):+d}"
+
+# column names and formats (as written by the acquisition program)
+_SummaryColumns = [
+    ("date",    str),
+    ("time",    str),
+    ("reading", lambda v: f"{v:<13.3f}"),
+    ("wAbs",    lambda v: f"{v:.4f}"),
+    ("pAbs",    lambda v: f"{v:.4f}"),
+    ("aAbs",    lambda v: _sci(v, " ")),
+    ("rAbs",    _sci),
+    ("oAbs",    _sci),
+    ("dvm",     _sci),
+    ("hDis",    _sci),
+    ("wDis",    _sci),
+    ("pDis",    lambda v: f"{v:.4f}"),
+    ("aDis",    _sci),
+    ("rDis",    _sci),
+    ("oDis",    _sci),
+    ]
+
+def _writeSummary(fp, columns):
+    # append the rows of the columns (as returned by import_FitSummary())
+    with open(fp, "a") as fh:
+        for i in range(len(columns["date"])):
+            fh.write("\t".join([f(columns[n][i]) for n, f in _SummaryColumns]) + "\n")
+    return
+
+def export_FitSummary(fp, infos, PA, PD, RA = None, RD = None):
+
+    """ 
+        append rows to the summary table fp. infos is one info
+        dictionary or a list of them, PA and PD are the absorption and
+        dispersion parameters (one row each), RA and RD the norms of
+        the residuals (NaN if not given). The instrument reading is not
+        in the sweep files: it is taken from info["reading"] if there
+        (NaN otherwise).
+    """
+
+    if isinstance(infos, dict): infos = [infos]
+    PA, PD = atleast_2d(PA), atleast_2d(PD)
+    M = len(infos)
+    RA = full(M, nan) if RA is None else atleast_1d(RA)
+    RD = full(M, nan) if RD is None else atleast_1d(RD)
+    columns = {n: [] for n, f in _SummaryColumns}
+    for info, (pa, wa, ha, oa), (pd, wd, hd, od), ra, rd in zip(infos, PA, PD, RA, RD):
+        # fitted width: half width at half maximum
+        wa, wd, drive = abs(2*wa), abs(2*wd), info["drive"]
+        row = {
+            "date"      :   info["date"],
+            "time"      :   info["time"],
+            "reading"   :   info.get("reading", nan),
+            "wAbs"      :   wa,
+            "pAbs"      :   pa,
+            "aAbs"      :   wa*ha/drive*1E6,
+            "rAbs"      :   ra,
+            "oAbs"      :   oa*1E9,
+            "dvm"       :   info.get("dvm", nan),
+            "hDis"      :   hd*1E9,
+            "wDis"      :   wd,
+            "pDis"      :   pd,
+            "aDis"      :   wd*hd/drive*1E6,
+            "rDis"      :   rd,
+            "oDis"      :   od*1E9,
+            }
+        for n in columns: columns[n].append(row[n])
+    _writeSummary(fp, columns)
+    return
+
+def import_FitSummary(fp):
+
+    """ 
+        read the summary table fp and return a dictionary of columns:
+        lists of strings for "date" and "time", numpy arrays for the
+        other columns (see _SummaryColumns). A sweep log (acquisition
+        program layout) gives "header" (the settings text), "filenum",
+        "date", "time" and "seconds". Any other layout raises a
+        ValueError.
+    """
+
+    with open(fp, "r") as fh:
+        lines = fh.readlines()
+    if any(match(_SweepLogRow, l) for l in lines):
+        return _importSweepLog(lines)
+    columns = {n: [] for n, f in _SummaryColumns}
+    for i, l in enumerate(lines):
+        if not l.strip(): continue
+        r = l.rstrip("\n").split("\t")
+        try:
+            if len(r) != len(_SummaryColumns) or not match(_SummaryDate, r[0]):
+                raise ValueError
+            for (n, f), v in zip(_SummaryColumns, r):
+                columns[n].append(v if f is str else float(v))
+        except ValueError:
+            raise ValueError(f"'{fp}' line {i+1}: not a summary table or a sweep log")
+    for n, f in _SummaryColumns:
+        if f is not str: columns[n] = array(columns[n])
+    return columns
+
+_SummaryDate = r"\d\d/\d\d/\d{4}$"
+
+_SweepLogRow = r"sweep\s+(\d+)\s+at:\t([^\t]*)\t([^\t\n]*)"
+
+def _importSweepLog(lines):
+    # settings block (kept as text), then one row per sweep
+    header, rows = [], []
+    for l in lines:
+        m = match(_SweepLogRow, l)
+        if m: rows.append(m.groups())
+        elif not rows: header.append(l)
+    return {
+        "header"    :   "".join(header),
+        "filenum"   :   array([int(n) for n, d, t in rows]),
+        "date"      :   [d for n, d, t in rows],
+        "time"      :   [t for n, d, t in rows],
+        "seconds"   :   array([_seconds(t) for n, d, t in rows]),
         }
 
-    data = loadtxt(fp,
-        comments    = ["%","freq"],
-        converters  = {
-            0: float,       # freq
-            1: float,       # Vx
-            2: float,       # Vy
-            3: float,       # time
-            },
-        )
+def export_SweepLog(fp, columns):
+
+    """ 
+        write the sweep log fp (acquisition program layout) from the
+        columns returned by import_FitSummary(): "header", "filenum",
+        "date" and "time".
+    """
+
+    with open(fp, "w") as fh:
+        fh.write(columns["header"])
+        for n, d, t in zip(columns["filenum"], columns["date"], columns["time"]):
+            fh.write(f"sweep {n}  at:\t{d}\t{t}\n")
+    return
 
-    T  = data[:, 3] - data[0, 3]
-    F  = data[:, 0]
-    X  = data[:, 1]
-    Y  = data[:, 2]
+#####################
+# fit results cache #
+#####################
 
-    return info, (T, F, X, Y)
+class FitCache():
 
+    """ 
+
+        FitCache(pathname, version) is a persistent store of fit results.
+        An entry is keyed on the content of the data file (sha1 hash) and
+        is only valid for the fit model version it was computed with. The
+        store is a json file, read on instantiation and written by save()
+        (or on exit when used as a context manager):
+
+        with FitCache("fits.json", sfitlib.FIT_MODEL_VERSION) as cache:
+            key = cache.key(fp)
+            entry = cache.get(key)
+            if entry is None:
+                ...
+                cache.put(key, info, pAbs = pAbs, pAbsCov = pAbsCov)
+            else:
+                info, results = entry
+
+        The least recently used entries are evicted beyond maxentries.
+        An unreadable store is replaced by an empty one (the reason is
+        kept in error, None otherwise).
+
+    """
+
+    def __init__(self, pathname, version, maxentries = 10000):
+        self.pathname = pathname
+        self.version = version
+        self.maxentries = maxentries
+        self.entries, self.error = {}, None
+        if exists(pathname):
+            try:
+                with open(pathname, "r") as fh:
+                    entries = load(fh)
+                if not isinstance(entries, dict):
+                    raise ValueError("not a dictionary")
+                self.entries = entries
+            except (OSError, ValueError) as error:
+                self.error = f"{type(error).__name__}: {error}"
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.save()
+        return False
+
+    def key(self, fp):
+        with open(fp, "rb") as fh:
+            return sha1(fh.read()).hexdigest()
+
+    def get(self, key):
+        e = self.entries.get(key)
+        # missing or computed with another fit model
+        if e is None or e["version"] != self.version:
+            return None
+        e["used"] = now()
+        results = {k: array(v) for k, v in e["results"].items()}
+        return e["info"], results
+
+    def put(self, key, info, **results):
+        self.entries[key] = {
+            "version"   :   self.version,
+            "used"      :   now(),
+            "info"      :   info,
+            "results"   :   {k: array(v).tolist() for k, v in results.items()},
+            }
+        return
+
+    def invalidate(self, key = None):
+        # remove one entry, or all entries when key is None
+        if key is None:
+            self.entries = {}
+        else:
+            self.entries.pop(key, None)
+        return
+
+    def evict(self, maxentries = None):
+        # remove stale versions and the least recently used entries
+        n = self.maxentries if maxentries is None else maxentries
+        E = [(e["used"], k) for k, e in self.entries.items() if e["version"] == self.version]
+        E.sort(reverse = True)
+        self.entries = {k: self.entries[k] for u, k in E[:n]}
+        return
+
+    def save(self):
+        self.evict()
+        # write a temporary file then replace the store
+        tmp = self.pathname+".tmp"
+        try:
+            with open(tmp, "w") as fh:
+                dump(self.entries, fh)
+            replace(tmp, self.pathname)
+        finally:
+            if exists(tmp): remove(tmp)
+        return
 
 version_history["0.0"] = """
 version 0.0 (13 december 2024):
     add import function: "import_TorsionOscilla_FreqScan_20241213_112400()"
 """
 
+version_history["0.1"] = """
+version 0.1 (17 october 2026):
+    single pass import: the header and the numeric block are read from
+    one file handle and the numeric block is parsed in one vectorized
+    call (numpy.fromstring) instead of numpy.loadtxt with converters.
+    the "%" comment lines of the numeric block are skipped, as before.
+    add "_parseFreqScanHeader()", "_parseFreqScanData()"
+"""
+
+version_history["0.2"] = """
+version 0.2 (17 october 2026):
+    add a persistent fit results cache keyed on the file content hash
+    and on the fit model version: "FitCache()"
+"""
+
+version_history["0.3"] = """
+version 0.3 (17 october 2026):
+    add summary table writer and reader (one row per sweep):
+    "export_FitSummary()", "import_FitSummary()"
+    the sweep logs of the acquisition program (".tat" files) are read
+    by "import_FitSummary()" and written by "export_SweepLog()"
+"""
+
+version_history["0.4"] = """
+version 0.4 (17 october 2026):
+    add binary sidecar files (float64 columns and a json header) read
+    back with numpy.memmap, with a staleness check on the data file
+    modification time and size:
+    "import_TorsionOscilla_FreqScan_20241213_112400(fp, sidecar = True)"
+"""
+
+version_history["0.5"] = """
+version 0.5 (17 october 2026):
+    add a single file archive for all the sweeps of a run, append only,
+    indexed by sweep number: "SweepArchive()"
+"""
+
+version_history["0.6"] = """
+version 0.6 (17 october 2026):
+    the imports are recorded as stages by sproflib when enabled (file,
+    points, wall and cpu time)
+"""
+
 ########
 # info #
 ########
@@ -164,6 +679,324 @@ if __name__ == "__main__":
 
         ### done
 
+    #############
+    # tests 0.1 #
+    #############
+
+    if "0.1" in TESTS:
+
+        lprint("running test version 0.1")
+
+        from time import perf_counter
+        from numpy import loadtxt, array_equal
+
+        fp = "../.data/fswp_full_1.dat"
+
+        # previous import path (two opens, loadtxt with converters)
+        def import_loadtxt(fp):
+            fh = open(fp, "r")
+            info = _parseFreqScanHeader(fh.readline(), fp)
+            fh.close()
+            data = loadtxt(fp,
+                comments    = ["%","freq"],
+                converters  = {0: float, 1: float, 2: float, 3: float},
+                )
+            T  = data[:, 3] - data[0, 3]
+            return info, (T, data[:, 0], data[:, 1], data[:, 2])
+
+        ### check both paths agree ###
+
+        I1, D1 = import_loadtxt(fp)
+        I2, D2 = import_TorsionOscilla_FreqScan_20241213_112400(fp)
+
+        lprint()
+        lprint(f"compare with loadtxt:")
+        lprint(f"---------------------")
+        lprint(f"\tinfo identical: {I1 == I2}")
+        lprint(f"\tdata identical: {all(array_equal(a, b) for a, b in zip(D1, D2))}")
+
+        # "%" comment line in the numeric block (skipped by loadtxt)
+        cp = "../.output/sielib_comment.dat"
+        with open(fp, "r") as fh:
+            L = fh.readlines()
+        with open(cp, "w") as fh:
+            fh.writelines(L[:5] + ["% drive changed\n"] + L[5:])
+        I3, D3 = import_TorsionOscilla_FreqScan_20241213_112400(cp)
+        lprint(f"\tcomment line: {all(array_equal(a, b) for a, b in zip(D1, D3))}")
+
+        ### benchmark ###
+
+        N = 200
+
+        t0 = perf_counter()
+        for i in range(N): import_loadtxt(fp)
+        t1 = perf_counter()
+        for i in range(N): import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        t2 = perf_counter()
+
+        lprint()
+        lprint(f"benchmark:")
+        lprint(f"----------")
+        lprint(f"\t{N} imports of '{fp}'")
+        lprint(f"\tloadtxt     : {(t1-t0)/N*1E3:8.3f} ms/file")
+        lprint(f"\tsingle pass : {(t2-t1)/N*1E3:8.3f} ms/file")
+        lprint(f"\tspeed up    : {(t1-t0)/(t2-t1):8.1f}")
+
+    #############
+    # tests 0.2 #
+    #############
+
+    if "0.2" in TESTS:
+
+        lprint("running test version 0.2")
+
+        from time import perf_counter
+
+        import sfitlib
+
+        fp = "../.data/fswp_full_1.dat"
+        cp = "../.output/sielib_cache.json"
+        version = sfitlib.FIT_MODEL_VERSION
+
+        cache = FitCache(cp, version)
+        cache.invalidate()
+
+        def process(fp):
+            info, data = import_TorsionOscilla_FreqScan_20241213_112400(fp)
+            T, F, X, Y = data
+            key = cache.key(fp)
+            entry = cache.get(key)
+            if entry is None:
+                (pAbs, pAbsCov, XF), (pDis, pDisCov, YF) = sfitlib.LorentzFit(F, X, Y)
+                cache.put(key, info, pAbs = pAbs, pAbsCov = pAbsCov, pDis = pDis, pDisCov = pDisCov)
+                return "fitted", pAbs
+            return "cached", entry[1]["pAbs"]
+
+        t0 = perf_counter()
+        s1, p1 = process(fp)
+        t1 = perf_counter()
+        s2, p2 = process(fp)
+        t2 = perf_counter()
+        cache.save()
+
+        lprint()
+        lprint(f"cache:")
+        lprint(f"------")
+        lprint(f"\tfirst  : {s1} ({(t1-t0)*1E3:.3f} ms)")
+        lprint(f"\tsecond : {s2} ({(t2-t1)*1E3:.3f} ms)")
+        lprint(f"\tsame parameters: {(p1 == p2).all()}")
+
+        # reload, then change the model version
+        lprint(f"\treloaded: {FitCache(cp, version).get(cache.key(fp)) is not None}")
+        lprint(f"\tother version: {FitCache(cp, 'x.x').get(cache.key(fp)) is not None}")
+
+        # a corrupt store is replaced by an empty one
+        with open(cp, "w") as fh: fh.write('{"a": [1, 2')
+        c = FitCache(cp, version)
+        lprint(f"\tcorrupt store: {len(c.entries)} entries ({c.error})")
+        # a store that cannot be written: no temporary file left
+        c.pathname = "../.output/no-folder/cache.json"
+        try:
+            c.save()
+        except OSError as error:
+            lprint(f"\tnot saved: {type(error).__name__}")
+
+    #############
+    # tests 0.3 #
+    #############
+
+    if "0.3" in TESTS:
+
+        lprint("running test version 0.3")
+
+        from os import remove
+        from numpy.linalg import norm
+
+        import sfitlib
+
+        FP = [
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_21.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_22.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_23.dat",
+            ]
+
+        tp = "../.output/sielib_.dat"
+        if exists(tp): remove(tp)
+
+        # batch fit of the first two sweeps
+        I, F, X, Y = [], [], [], []
+        for fp in FP[:2]:
+            info, (t, f, x, y) = import_TorsionOscilla_FreqScan_20241213_112400(fp)
+            I.append(info); F.append(f); X.append(x); Y.append(y)
+        (PA, CA), (PD, CD) = sfitlib.LorentzBatchFit(array(F), array(X), array(Y))
+        RA = norm(array(X) - sfitlib.LorentzAbsorptionFit_Function(array(F), *PA.T[:, :, None]), axis = 1)
+        RD = norm(array(Y) - sfitlib.LorentzDispersionFit_Function(array(F), *PD.T[:, :, None]), axis = 1)
+        export_FitSummary(tp, I, PA, PD, RA, RD)
+
+        # later, a third sweep is appended alone
+        info, (t, f, x, y) = import_TorsionOscilla_FreqScan_20241213_112400(FP[2])
+        (pa, ca, xf), (pd, cd, yf) = sfitlib.LorentzFit(f, x, y)
+        export_FitSummary(tp, info, pa, pd, norm(x-xf), norm(y-yf))
+
+        S = import_FitSummary(tp)
+
+        # summary table of the acquisition program, read and written back
+        dp = "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)_.dat"
+        D = import_FitSummary(dp)
+        if exists("../.output/sielib_copy_.dat"): remove("../.output/sielib_copy_.dat")
+        _writeSummary("../.output/sielib_copy_.dat", D)
+        with open(dp, "rb") as fh: d1 = fh.read()
+        with open("../.output/sielib_copy_.dat", "rb") as fh: d2 = fh.read()
+
+        # any other layout is an error
+        try:
+            import_FitSummary(FP[0])
+            error = "no error"
+        except ValueError as e:
+            error = f"ValueError ({e})"
+
+        # sweep log of the acquisition program, read and written back
+        lp = "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)_.tat"
+        L = import_FitSummary(lp)
+        export_SweepLog("../.output/sielib_log.tat", L)
+        with open(lp, "rb") as fh: b1 = fh.read()
+        with open("../.output/sielib_log.tat", "rb") as fh: b2 = fh.read()
+
+        lprint()
+        lprint(f"summary table:")
+        lprint(f"--------------")
+        lprint(f"\t{'':>8} {'time':>10} {'position':>10} {'FWHM':>10} {'position':>10} {'FWHM':>10}")
+        for n, T in [("fitted", S), ("recorded", D)]:
+            for i in range(len(T["time"])):
+                lprint(f"\t{n:>8} {T['time'][i]:>10} "
+                    f"{T['pAbs'][i]:10.4f} {T['wAbs'][i]:10.4f} {T['pDis'][i]:10.4f} {T['wDis'][i]:10.4f}")
+        lprint(f"\trecorded table round trip identical: {d1 == d2}")
+        lprint(f"\tsweep file read as a table: {error}")
+
+        lprint()
+        lprint(f"sweep log:")
+        lprint(f"----------")
+        lprint(f"\tsweeps  : {L['filenum'].tolist()} at {L['time']}")
+        lprint(f"\tsettings: {len(L['header'].splitlines())} lines")
+        lprint(f"\tround trip identical: {b1 == b2}")
+
+    #############
+    # tests 0.4 #
+    #############
+
+    if "0.4" in TESTS:
+
+        lprint("running test version 0.4")
+
+        from os import remove
+        from time import perf_counter
+        from numpy import array_equal
+
+        # large synthetic sweep from the test file
+        fp = "../.data/fswp_full_1.dat"
+        lp = "../.output/sielib_long.dat"
+        with open(fp, "r") as fh:
+            L = fh.readlines()
+        with open(lp, "w") as fh:
+            fh.writelines(L[:2] + L[2:]*1000)
+        if exists(lp+".bin"): remove(lp+".bin")
+
+        lprint()
+        lprint(f"binary sidecar:")
+        lprint(f"---------------")
+
+        for p in [fp, lp]:
+
+            I1, D1 = import_TorsionOscilla_FreqScan_20241213_112400(p)
+            I2, D2 = import_TorsionOscilla_FreqScan_20241213_112400(p, sidecar = True)
+            I3, D3 = import_TorsionOscilla_FreqScan_20241213_112400(p, sidecar = True)
+
+            N = 20
+            t0 = perf_counter()
+            for i in range(N): import_TorsionOscilla_FreqScan_20241213_112400(p)
+            t1 = perf_counter()
+            for i in range(N): import_TorsionOscilla_FreqScan_20241213_112400(p, sidecar = True)
+            t2 = perf_counter()
+
+            lprint()
+            lprint(f"\t'{p}' ({D1[0].size} rows)")
+            lprint(f"\tidentical   : {I1 == I3 and all(array_equal(a, b) for a, b in zip(D1, D3))}")
+            lprint(f"\ttext        : {(t1-t0)/N*1E3:8.3f} ms/file")
+            lprint(f"\tsidecar     : {(t2-t1)/N*1E3:8.3f} ms/file")
+
+        # a modified data file makes the sidecar stale
+        with open(lp, "a") as fh:
+            fh.writelines(L[2:3])
+        I4, D4 = import_TorsionOscilla_FreqScan_20241213_112400(lp, sidecar = True)
+        lprint()
+        lprint(f"\tstale sidecar re-written: {D4[0].size == D1[0].size+1}")
+
+        # a truncated sidecar (interrupted write) is a cache miss
+        with open(lp+".bin", "r+b") as fh:
+            fh.truncate(stat(lp+".bin").st_size//2)
+        I5, D5 = import_TorsionOscilla_FreqScan_20241213_112400(lp, sidecar = True)
+        lprint(f"\ttruncated sidecar re-written: {array_equal(D5[1], D4[1])}, "
+            f"{_readSidecar(lp) is not None}")
+
+        # cleanup the sidecar of the test file
+        remove(fp+".bin")
+
+    #############
+    # tests 0.5 #
+    #############
+
+    if "0.5" in TESTS:
+
+        lprint("running test version 0.5")
+
+        from os import remove
+        from time import perf_counter
+        from numpy import array_equal
+
+        FP = [
+            "../.data/fswp_full_1.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_21.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_22.dat",
+            "../.data/TO11122024_7000mVAC200VDCAir_(VACUUM)__full_23.dat",
+            ]
+
+        ap = "../.output/sielib.fsa"
+        if exists(ap): remove(ap)
+
+        archive = SweepArchive(ap)
+        for fp in FP: archive.add(fp)
+        added = archive.add(FP[0])
+
+        # re-open and check all sweeps
+        archive = SweepArchive(ap)
+
+        lprint()
+        lprint(f"sweep archive:")
+        lprint(f"--------------")
+        lprint(f"\tsweeps      : {sorted(archive.sweeps.keys())}")
+        lprint(f"\tduplicate   : {'added' if added else 'skipped'}")
+        for fp in FP:
+            I1, D1 = import_TorsionOscilla_FreqScan_20241213_112400(fp)
+            I2, D2 = archive.load(I1["filenum"])
+            same = I1 == I2 and all(array_equal(a, b) for a, b in zip(D1, D2))
+            lprint(f"\tsweep {I1['filenum']:5} : {'identical' if same else 'DIFFERENT'}")
+        lprint(f"\tfind        : {archive.find(date = '11/12/2024', drive = 7.0)}")
+
+        # truncated archive (interrupted write)
+        with open(ap, "r+b") as fh:
+            fh.truncate(archive.end - 100)
+        archive = SweepArchive(ap)
+        lprint(f"\ttruncated   : {sorted(archive.sweeps.keys())}")
+        archive.add(FP[3])
+        lprint(f"\tre-appended : {sorted(SweepArchive(ap).sweeps.keys())}")
+
+        # load time
+        N = 1000
+        t0 = perf_counter()
+        for i in range(N): archive.load(22)
+        t1 = perf_counter()
+        lprint(f"\tload time   : {(t1-t0)/N*1E3:.3f} ms/sweep")
+
     #############
     # tests x.x #
     #############
@@ -32,13 +32,39 @@ version_history = {}
     
 """
 
+# built-in imports
+# ----------------
+
+from io import BytesIO
+from os import remove
+from os import replace
+from os.path import exists
+from os.path import getsize
+from threading import Lock
+from threading import local
+from functools import lru_cache
+from weakref import WeakKeyDictionary
+from re import search
+from re import findall
+from re import compile as recompile
+
 # From "https://matplotlib.org/"
 # ------------------------------
 
-from matplotlib.pyplot import close
-from matplotlib.pyplot import figure
-from matplotlib.pyplot import fignum_exists
-from matplotlib.backends.backend_pdf import PdfPages
+# the figure classes and the pdf backend are imported on first use
+# only (import time). pyplot is not used: the figures are built with
+# their own canvas (see MakeFigure) and are registered by name here.
+
+def _Figure(*args, **kwargs):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fg = Figure(*args, **kwargs)
+    FigureCanvasAgg(fg)
+    return fg
+
+def PdfPages(*args, **kwargs):
+    from matplotlib.backends.backend_pdf import PdfPages
+    return PdfPages(*args, **kwargs)
 
 # From "https://numpy.org/"
 # -------------------------
@@ -49,6 +75,23 @@ from numpy import floor
 from numpy import log10
 from numpy import absolute
 from numpy import linspace
+from numpy import asarray
+from numpy import ndim
+from numpy import lexsort
+from numpy import unique
+from numpy import concatenate
+from numpy import r_
+from numpy import inf
+from numpy import isfinite
+
+# From the local package
+# ----------------------
+
+try: # import from built
+    from fswp2pdf import sproflib
+except ImportError as error:
+    # local import
+    import sproflib
 
 ####################
 # "Aclass" formats #
@@ -82,12 +125,98 @@ class AClass():
     def PaperSize(self, Format):
         return self.sizes[Format]
 
+# the sizes are computed once (used by MakeFigure)
+_PaperSizes = AClass().sizes
+
+##############
+# MakeFigure #
+##############
+
+def MakeFigure(
+        size        =       "A4",   # choose from A0 to A10
+        border      =       15.0,   # percentage of the full page
+        orientation =  "portrait",  # use "portrait" or "landscape"
+        ):
+
+    """ 
+        create a figure (with its own Agg canvas, independent of pyplot)
+        and its axes, and return both handles. The figure is not named,
+        not registered and not selected: use the handles directly, or
+        SelectFigure(name) for the named figures used by the helpers.
+    """
+
+    # get paper dimensions in mm (Short and Large)
+    # size is a string describing the document size.
+    # so far, only A-class sizes are implemented.
+    S, L = _PaperSizes[size]
+    # compute axes width and height in paper units:
+    # border is the minimum border size surrounding the axes
+    # this is the left and right borders for portrait orientation
+    # this is the top and bottom borders for landscape orientation
+    # both axes are constrained to have the same length in mm
+    # thus they have a fixed ratio S/L in page units (fraction of 1.0)
+    m = border/100.0    # short border size in page units
+    l = 1.0-2.0*m       # axis length (large value in page units)
+    s = l*S/L           # axis length (small value in page units)
+    q = (1.0-s)/2.0     # large border size in page units
+    # compute paper size and margins from the page orientation
+    # W and w for width, H and h for height, x and y the axes offset
+    (W, H, w, h, x, y) = {
+        "PORTRAIT":  (S, L, l, s, m, q),
+        "LANDSCAPE": (L, S, s, l, q, m),
+    }[orientation.upper()]
+    # create figure, size in inches
+    fg = _Figure(figsize = (W/25.4, H/25.4))
+    # create axes (position and size)
+    ax = fg.add_axes([x, y, w, h])
+    # done
+    return fg, ax
+
 ################
 # selectFigure #
 ################
 
-_CurrentFigure = None
-_CurrentFigureAxes = None
+class Handles():
+
+    """
+
+        explicit handles of a figure and of its axes. Used as a context
+        manager, the handles become the current figure and axes of the
+        calling thread (used by the helper functions: Plot, AutoRange,
+        Text, ...), the previous ones are restored on exit:
+
+        fg, ax = MakeFigure()
+        with Handles(fg, ax):
+            Plot(F, X, ".b")
+            AutoStyle(F, X)
+
+    """
+
+    def __init__(self, fg = None, ax = None):
+        self.figure = fg
+        self.axes = ax
+        return
+
+    def __enter__(self):
+        self.previous = _Current.figure, _Current.axes
+        _Current.figure, _Current.axes = self.figure, self.axes
+        return self
+
+    def __exit__(self, *args):
+        _Current.figure, _Current.axes = self.previous
+        return False
+
+class _CurrentHandles(local):
+    # one current figure and axes per thread
+    figure = None
+    axes = None
+
+# named figures (replaces the pyplot figure manager)
+_Figures = {}
+_FiguresLock = Lock()
+
+# current figure and axes handles (per thread)
+_Current = _CurrentHandles()
 
 def SelectFigure(name, 
         size        =       "A4",   # choose from A0 to A10
@@ -95,56 +224,196 @@ def SelectFigure(name,
         orientation =  "portrait",  # use "portrait" or "landscape"
         ):
 
-    if not fignum_exists(name):
-        # create default figure and axes
-        fg = figure(name)
-        # get paper dimensions in mm (Short and Large)
-        # size is a string describing the document size.
-        # so far, only A-class sizes are implemented.
-        S, L = AClass().PaperSize(size)
-        # compute axes width and height in paper units:
-        # border is the minimum border size surrounding the axes
-        # this is the left and right borders for portrait orientation
-        # this is the top and bottom borders for landscape orientation
-        # both axes are constrained to have the same length in mm
-        # thus they have a fixed ratio S/L in page units (fraction of 1.0)
-        m = border/100.0    # short border size in page units
-        l = 1.0-2.0*m       # axis length (large value in page units)
-        s = l*S/L           # axis length (small value in page units)
-        q = (1.0-s)/2.0     # large border size in page units
-        # compute paper size and margins from the page orientation
-        # W and w for width, H and h for height, x and y the axes offset
-        (W, H, w, h, x, y) = {
-            "PORTRAIT":  (S, L, l, s, m, q),
-            "LANDSCAPE": (L, S, s, l, q, m),
-        }[orientation.upper()]
-        # set figure size in inches
-        fg.set_size_inches(W/25.4, H/25.4)
-        # create axes (position and size)
-        ax = fg.add_axes([x, y, w, h])
-
-    else:
-        # select any existing figure
-        fg = figure(name)
-        # get the figure first axes
-        ax = fg.get_axes()[0]
+    with _FiguresLock:
+        if name not in _Figures:
+            # create default figure and axes
+            _Figures[name] = MakeFigure(size, border, orientation)
+        # select figure and axes
+        fg, ax = _Figures[name]
 
     # update current values
-    global _CurrentFigure
-    global _CurrentFigureAxes
-    _CurrentFigure       = fg
-    _CurrentFigureAxes   = ax
+    _Current.figure = fg
+    _Current.axes   = ax
 
     # done (return figure and axes)
     return fg, ax
 
+def CloseFigure(name):
+    # forget a named figure (and unselect it)
+    with _FiguresLock:
+        fg, ax = _Figures.pop(name, (None, None))
+    if fg is not None and _Current.figure is fg:
+        _Current.figure, _Current.axes = None, None
+    return
+
+def FigureExists(name):
+    return name in _Figures
+
 # get the current figure handle
 def cfg():
-    return _CurrentFigure
+    return _Current.figure
 
 # get the current axes handle
 def cfa():
-    return _CurrentFigureAxes
+    return _Current.axes
+
+#############
+# pdf pages #
+#############
+
+""" 
+    matplotlib writes pdf files with a single classic cross-reference
+    table and with all the object references outside of the (compressed)
+    stream data. This is enough to concatenate the pages of several pdf
+    files without re-rendering them: the objects of each file are
+    renumbered and the pages are collected under one new page tree.
+    The objects that are the same in several files (the fonts, their
+    glyphs, the markers) are kept once.
+"""
+
+_pdfReference = recompile(rb"(\d+) 0 R")
+
+def _readPdfObjects(data):
+    # read the cross-reference table
+    x = int(data[data.rindex(b"startxref")+9:].split()[0])
+    t = data.index(b"trailer", x)
+    E = data[x:t].split()[3:]
+    offsets = {}
+    for i in range(0, len(E), 3):
+        if E[i+2] == b"n": offsets[i//3] = int(E[i])
+    # object bodies (from offset to the next offset)
+    O, P = {}, sorted(offsets.items(), key = lambda n: n[1])
+    for (n, s), (m, e) in zip(P, P[1:]+[(None, x)]):
+        O[n] = data[data.index(b"obj", s)+3:data.rindex(b"endobj", s, e)]
+    # trailer entries
+    trailer = data[t:]
+    root = int(search(rb"/Root (\d+) 0 R", trailer).group(1))
+    info = search(rb"/Info (\d+) 0 R", trailer)
+    info = int(info.group(1)) if info else None
+    # done (header, objects, root and info numbers)
+    return data[:P[0][1]], O, root, info
+
+class _PdfMerge():
+
+    """ 
+        the pages of pdf documents produced by matplotlib, renumbered
+        and kept in memory: add(data) reads one more document (only),
+        write(fh) writes the merged document to the file handle fh
+        (opened in binary mode). The objects that are identical once
+        renumbered (fonts, font descriptors, glyphs, markers...) are
+        written once and shared by the pages.
+    """
+
+    def __init__(self):
+        # reserved numbers: catalog (1), page tree (2), info (3)
+        self.header, self.objects, self.kids, self.n = b"", {}, [], 3
+        # object numbers by (renumbered) object body
+        self.shared = {}
+        return
+
+    def _new(self):
+        self.n += 1
+        return self.n
+
+    def add(self, data):
+        h, O, root, info = _readPdfObjects(data)
+        tree = int(search(rb"/Pages (\d+) 0 R", O[root]).group(1))
+        kids = [int(i) for i in findall(rb"(\d+) 0 R", search(rb"/Kids \[([^\]]*)\]", O[tree]).group(1))]
+        # the page tree becomes the new tree
+        R = {tree: 2}
+        # keep the header and the info of the first document
+        if not self.header:
+            self.header = h
+            if info is not None: R[info] = 3
+        # references of each object (outside of the stream data)
+        ref = lambda m: b"%d 0 R" % R[int(m.group(1))]
+        def number(i):
+            # renumber the objects referenced first (depth first)
+            if i in R:
+                # reference cycle: numbered now, not shared
+                if R[i] is None: R[i] = self._new()
+                return
+            R[i] = None
+            head, sep, tail = O[i].partition(b"stream")
+            for j in _pdfReference.findall(head): number(int(j))
+            body = _pdfReference.sub(ref, head)+sep+tail
+            if R[i] is None and i not in kids:
+                # identical objects are shared (not the pages)
+                R[i] = self.shared.get(body) or self._new()
+                self.shared.setdefault(body, R[i])
+            elif R[i] is None:
+                R[i] = self._new()
+            self.objects[R[i]] = body
+            return
+        for i in kids: number(i)
+        for i in sorted(O):
+            if i not in (root, tree, info): number(i)
+        if R.get(info) == 3:
+            head, sep, tail = O[info].partition(b"stream")
+            self.objects[3] = _pdfReference.sub(ref, head)+sep+tail
+        # collect pages in order
+        self.kids += [R[i] for i in kids]
+        return
+
+    def write(self, fh):
+
+        n, objects = self.n, self.objects
+
+        # new catalog, page tree and info
+        objects[1] = b"\n<< /Type /Catalog /Pages 2 0 R >>\n"
+        K = b" ".join(b"%d 0 R" % i for i in self.kids)
+        objects[2] = b"\n<< /Type /Pages /Kids [ %s ] /Count %d >>\n" % (K, len(self.kids))
+        if 3 not in objects: objects[3] = b"\n<< >>\n"
+
+        # write objects
+        B, offsets = [self.header], [0]*(n+1)
+        p = len(self.header)
+        for i in range(1, n+1):
+            offsets[i] = p
+            b = b"%d 0 obj%sendobj\n" % (i, objects[i])
+            B.append(b)
+            p += len(b)
+
+        # write cross-reference table and trailer
+        B.append(b"xref\n0 %d\n0000000000 65535 f \n" % (n+1))
+        B += [b"%010d 00000 n \n" % o for o in offsets[1:]]
+        B.append(b"trailer\n<< /Size %d /Root 1 0 R /Info 3 0 R >>\n" % (n+1))
+        B.append(b"startxref\n%d\n%%%%EOF\n" % p)
+        fh.write(b"".join(B))
+
+        # done
+        return
+
+def _catPdfPages(documents, fh):
+
+    """ 
+        concatenate the pages of a list of pdf data (bytes) produced by
+        matplotlib, in order, and write the new document to the file
+        handle fh (opened in binary mode).
+    """
+
+    m = _PdfMerge()
+    for data in documents: m.add(data)
+    m.write(fh)
+    return
+
+def RenderPage(fg):
+    # render a figure handle to a single page pdf document (bytes)
+    with sproflib.Stage("render") as st:
+        fh = BytesIO()
+        fg.savefig(fh, format = "pdf", **_SaveOptions(fg))
+        # saving restores some figure properties and marks it stale
+        fg.stale = False
+        st.set(bytes = fh.tell())
+    return fh.getvalue()
+
+def CatPages(pathname, pages):
+    # write the pages (pdf documents as bytes) in order to one document
+    with sproflib.Stage("write", file = pathname, pages = len(pages)) as st:
+        with open(pathname, "wb") as fh:
+            _catPdfPages(pages, fh)
+            st.set(bytes = fh.tell())
+    return
 
 ############
 # Document #
@@ -152,10 +421,28 @@ def cfa():
 
 class Document():
 
-    def __init__(self, pathname, *figures):
+    """ 
+
+        Document(pathname, *figures) collects named figures and exports
+        them as one multi-page pdf file on each call of updatefile().
+        
+        With incremental = True, the rendered page of each figure is kept
+        in memory and updatefile() only renders the figures that are new,
+        or that have been modified since the last update (matplotlib
+        marks them "stale"). The cached pages are then concatenated into
+        the output file. Use touchfigure(name) to force a new rendering.
+        A finished figure can be frozen with freezefigure(name): its page
+        is rendered once, kept, and the figure is closed.
+
+    """
+
+    def __init__(self, pathname, *figures, incremental = False):
         self.pathname   = pathname
         self.filehandle = None
-        self.figures = figures if figures else []
+        self.figures = list(figures) if figures else []
+        self.incremental = incremental
+        self.pages = {}
+        self.frozen = set()
         self.updatefile()
         return
 
@@ -172,22 +459,186 @@ class Document():
             self.figures.append(name)
         return
 
+    def touchfigure(self, name):
+        if name not in self.frozen:
+            self.pages.pop(name, None)
+        return
+
+    def freezefigure(self, name):
+        # incremental mode only: keep the page, close the figure
+        self.addfigure(name)
+        if name not in self.frozen:
+            self.pages[name] = self._renderpage(name)
+            CloseFigure(name)
+            self.frozen.add(name)
+        return
+
+    def _renderpage(self, name):
+        fg, ax = SelectFigure(name)
+        return RenderPage(fg)
+
     def updatefile(self):
         if self.figures:
-            self._openfile()
-            for f in self.figures:
-                args = SelectFigure(f)
-                self.filehandle.savefig(args[0])
-            self._closefile()
+            if self.incremental:
+                self._updatepages()
+            else:
+                with sproflib.Stage("write", file = self.pathname, pages = len(self.figures)) as st:
+                    self._openfile()
+                    for f in self.figures:
+                        args = SelectFigure(f)
+                        self.filehandle.savefig(args[0], **_SaveOptions(args[0]))
+                    self._closefile()
+                    if sproflib.Enabled(): st.set(bytes = getsize(self.pathname))
+        return
+
+    def _updatepages(self):
+        # render new or modified figures only
+        for f in self.figures:
+            if f in self.frozen: continue
+            if f not in self.pages or SelectFigure(f)[0].stale:
+                self.pages[f] = self._renderpage(f)
+        # stitch pages
+        CatPages(self.pathname, [self.pages[f] for f in self.figures])
         return
 
     # rename close() method to clear()
     def close(self):
         if self.figures:
             for f in self.figures:
-                fg, ax = SelectFigure(f)
-                close(fg)
+                CloseFigure(f)
         self.figures = []
+        self.pages = {}
+        self.frozen = set()
+        return
+
+##################
+# StreamDocument #
+##################
+
+class StreamDocument():
+
+    """ 
+
+        StreamDocument(pathname) keeps the pdf file open and appends the
+        page of a figure as soon as addfigure(name) is called. The figure
+        is then closed, thus the memory used does not grow with the number
+        of pages. Use it as a context manager to close the file:
+
+        with StreamDocument("document.pdf") as doc:
+            SelectFigure("myfig")
+            ...
+            doc.addfigure("myfig")
+
+    """
+
+    def __init__(self, pathname):
+        self.pathname   = pathname
+        self.filehandle = PdfPages(self.pathname)
+        self.pages = 0
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def _tell(self):
+        # bytes written so far (the fonts are written on close)
+        f = getattr(self.filehandle, "_file", None)
+        return f.fh.tell() if f else 0
+
+    def addfigure(self, name):
+        fg, ax = SelectFigure(name)
+        self.addpage(fg)
+        CloseFigure(name)
+        return
+
+    def addpage(self, fg):
+        # append the page of a figure handle (the figure is kept)
+        with sproflib.Stage("page", page = self.pages+1) as st:
+            n = self._tell() if sproflib.Enabled() else 0
+            self.filehandle.savefig(fg, **_SaveOptions(fg))
+            if sproflib.Enabled(): st.set(bytes = self._tell()-n)
+        self.pages += 1
+        return
+
+    def updatefile(self):
+        # pages are written by addfigure()
+        return
+
+    def close(self):
+        if self.filehandle:
+            with sproflib.Stage("write", file = f"{self.pathname}", pages = self.pages) as st:
+                self.filehandle.close()
+                # total size (with the fonts)
+                if sproflib.Enabled(): st.set(bytes = self.pathname.tell()
+                    if hasattr(self.pathname, "tell") else getsize(self.pathname))
+        self.filehandle = None
+        return
+
+###############
+# CatDocument #
+###############
+
+class CatDocument():
+
+    """ 
+
+        CatDocument(pathname) is a document growing by one page at a
+        time, the pages being pdf data (bytes) as returned by RenderPage().
+        The merged objects are kept in memory: addpage(data) only reads
+        the new page. The file is written to a temporary file that then
+        replaces the previous one (the temporary file is removed if the
+        writing fails). An existing document (written by CatPages() or
+        by CatDocument()) is continued with load().
+
+    """
+
+    def __init__(self, pathname):
+        self.pathname = pathname
+        self.merge = _PdfMerge()
+        self.pages = 0
+        return
+
+    def load(self):
+        # continue the document of the file (if any)
+        if exists(self.pathname):
+            with open(self.pathname, "rb") as fh:
+                merge = _PdfMerge()
+                merge.add(fh.read())
+            self.merge, self.pages = merge, len(merge.kids)
+        return
+
+    def addpage(self, data):
+        # append the page (the document is unchanged if the writing fails)
+        m = self.merge
+        n, k, header = m.n, len(m.kids), m.header
+        m.add(data)
+        try:
+            self.updatefile()
+        except Exception:
+            # drop the objects of the page
+            for i in range(n+1, m.n+1): m.objects.pop(i)
+            m.shared = {b: i for b, i in m.shared.items() if i <= n}
+            if not header: m.objects.pop(3, None)
+            m.n, m.header = n, header
+            del m.kids[k:]
+            raise
+        self.pages = len(m.kids)
+        return
+
+    def updatefile(self):
+        tmp = self.pathname+".tmp"
+        with sproflib.Stage("write", file = self.pathname, pages = len(self.merge.kids)) as st:
+            try:
+                with open(tmp, "wb") as fh:
+                    self.merge.write(fh)
+                    st.set(bytes = fh.tell())
+                replace(tmp, self.pathname)
+            finally:
+                if exists(tmp): remove(tmp)
         return
 
 ##################
@@ -244,15 +695,43 @@ def _getTickPositions(start, stop, ticks):
     # done
     return M, S
 
+def _Limits(*tables):
+    # minimum and maximum of the finite values of all tables
+    S, E = inf, -inf
+    for T in tables:
+        T = asarray(T, dtype = float)
+        if not T.size: continue
+        s, e = T.min(), T.max()
+        # nan or inf (the slow path only)
+        if not (isfinite(s) and isfinite(e)):
+            T = T[isfinite(T)]
+            if not T.size: continue
+            s, e = T.min(), T.max()
+        S, E = min(S, s), max(E, e)
+    # done (inf, -inf without finite values)
+    return float(S), float(E)
+
+@lru_cache(maxsize = 256)
+def _cachedTickPositions(start, stop, ticks):
+    M, S = _getTickPositions(start, stop, ticks)
+    # the cached arrays are shared
+    M.flags.writeable, S.flags.writeable = False, False
+    return M, S
+
+def TickLayout(start, stop, ticks):
+    # tick positions, memoized on the limits (rounded to 12 significant
+    # digits) and the number of ticks. The least recently used layouts
+    # are dropped beyond 256 entries. Returns read-only arrays.
+    return _cachedTickPositions(
+        float(f"{start:.12g}"), float(f"{stop:.12g}"), int(ticks))
+
 def GetUnitPrefix(*tables):
-    # find minimum and maximum in first table
-    S, E = min(tables[0]), max(tables[0])
     # find minimum and maximum in all tables
-    for T in tables[1:]:
-        s, e = min(T), max(T)
-        S, E = min(S, s), max(E, e)
+    S, E = _Limits(*tables)
     # get the maximum absolute value
-    ma = max(absolute(S), absolute(E))
+    ma = max(absolute(S), absolute(E)) if S <= E else 0.0
+    # get the exponent (no prefix for zero or missing data)
+    n = int(floor(log10(ma)/3)) if ma > 0.0 else 0
     # compute prefactor and prefix
     prefactor, prefix = {   
          0: (1E+00, ""),
@@ -264,7 +743,7 @@ def GetUnitPrefix(*tables):
         +2: (1E-06, "M"),
         +3: (1E-09, "G"),
         +4: (1E-12, "T"),
-    }[int(floor(log10(ma)/3))]
+    }[min(max(n, -4), +4)]
     # done
     return prefactor, prefix 
 
@@ -272,10 +751,9 @@ def AutoRange(axis, *data, origin = False):
     # fixed extensions (left, right)
     l, r = 0.1, 0.1 # (switch left, right to low, high?)
     # find limits
-    S, E = min(data[0]), max(data[0])
-    for d in data[1:]:
-        s, e = min(d), max(d)
-        S, E = min(S, s), max(E, e)
+    S, E = _Limits(*data)
+    # no finite data
+    if S > E: S, E = 0.0, 0.0
     # add origin
     if origin: S, E = min(S, 0.0), max(E, 0.0)
     # prevent zero length (scale 1.0 to the decade?)
@@ -294,8 +772,8 @@ def AutoTick(axis, ticks = 5):
         "x": cfa().get_xlim,
         "y": cfa().get_ylim
         }[axis]()
-    # get tick positions
-    M, S = _getTickPositions(s, e, ticks)
+    # get tick positions (memoized)
+    M, S = TickLayout(s, e, ticks)
     # get method on selected axis
     set_ticks = {
         "x": cfa().set_xticks,
@@ -334,12 +812,78 @@ def Xlim(S, E):
 def Ylim(S, E):
     return cfa().set_ylim(S, E)
 
-def Plot(*args, **kwargs):
+def Decimate(x, y, columns):
+    # keep the first, the minimum, the maximum and the last point of y
+    # in each of the columns dividing the range of x (in data order)
+    x, y = asarray(x), asarray(y)
+    if len(x) <= 4*columns: return x, y
+    s, e = x.min(), x.max()
+    if not e > s: return x, y
+    b = ((x-s)*(columns/(e-s))).astype(int).clip(0, columns-1)
+    # sort by column, then by value
+    o = lexsort((y, b))
+    bo = b[o]
+    new = r_[True, bo[1:] != bo[:-1]]
+    end = r_[bo[1:] != bo[:-1], True]
+    # first and last points of each column (in data order)
+    c = lexsort((range(len(b)), b))
+    bc = b[c]
+    k = unique(concatenate([o[new], o[end],
+        c[r_[True, bc[1:] != bc[:-1]]],
+        c[r_[bc[1:] != bc[:-1], True]]]))
+    return x[k], y[k]
+
+def _PixelColumns():
+    # width of the current axes in pixels (at the figure resolution)
+    return int(cfa().get_window_extent().width)
+
+# resolution of the rasterized layers of each figure (used on saving,
+# the figure dpi is not modified)
+_RasterDpi = WeakKeyDictionary()
+
+def _SaveOptions(fg):
+    # savefig() options of a figure
+    return {"dpi": _RasterDpi[fg]} if fg in _RasterDpi else {}
+
+def Plot(*args, rasterize = None, decimate = None, **kwargs):
+    """
+        rasterize = dpi: the line or markers are rendered as an image at
+        dpi dots per inch in vector outputs. The dpi is only applied
+        when the page is saved (the figure dpi, the pixel columns and
+        the other layers are unchanged). matplotlib renders all the
+        rasterized layers of a figure at one resolution: the highest
+        dpi asked for the figure is used.
+        (rasterize = True: at the figure dpi).
+        decimate = columns: only the envelope of each (x, y) pair is
+        plotted: the first, last, minimum and maximum points in each of
+        the columns (True: one column per pixel of the axes).
+    """
     if isinstance(args[0], str):
         SelectFigure(args[0])
         args = args[1:]
+    if rasterize:
+        fg = cfg()
+        dpi = fg.dpi if rasterize is True else rasterize
+        _RasterDpi[fg] = max(_RasterDpi.get(fg, 0), dpi)
+        kwargs["rasterized"] = True
+    if decimate:
+        if decimate is True: decimate = _PixelColumns()
+        args = _decimatePairs(args, decimate)
     return cfa().plot(*args, **kwargs)
 
+def _decimatePairs(args, columns):
+    # decimate each (x, y) pair of the plot() arguments x, y[, fmt], ...
+    A, i = [], 0
+    while i < len(args):
+        x, y = args[i], args[i+1] if i+1 < len(args) else ""
+        if not isinstance(x, str) and not isinstance(y, str) and ndim(x) == ndim(y) == 1:
+            A += Decimate(x, y, columns)
+            i += 2
+        else:
+            A.append(x)
+            i += 1
+    return tuple(A)
+
 def legend(*args, position = "top", **kwargs):
 
     # get plot bounds (in page units)
@@ -358,7 +902,26 @@ def legend(*args, position = "top", **kwargs):
         bbox_to_anchor = (x, y),
         *args, **kwargs)
 
-def Text(text, position = "top"):
+def FormatBlock(text):
+    # pad the lines to the same length and remove the common leading
+    # spaces (all passes are linear in the length of the text)
+    L = text.split("\n")
+    n = max(map(len, L))
+    L = [l.ljust(n) for l in L]
+    m = min([len(l)-len(l.lstrip(" ")) for l in L if l], default = 0)
+    return "\n" + "\n".join([l[m:] for l in L]) + "\n"
+
+def FormatTable(rows, header = None, separator = "  "):
+    # right aligned columns, values are converted with str(), an
+    # optional header is underlined
+    R = [[str(v) for v in row] for row in rows]
+    if header: R.insert(0, [str(v) for v in header])
+    W = [max(map(len, c)) for c in zip(*R)]
+    L = [separator.join([f"{v:>{w}}" for v, w in zip(r, W)]) for r in R]
+    if header: L.insert(1, separator.join(["-"*w for w in W]))
+    return "\n".join(L)
+
+def Text(text, position = "top", fontsize = "small"):
 
     # get plot bounds (in page units)
     l, b, w, h = cfa().get_position().bounds
@@ -368,32 +931,14 @@ def Text(text, position = "top"):
         "RIGHT"     : (l+w+l/2, 0.5),
         "BOTTOM"    : (0.5, b/2),
         "TOP"       : (0.5, b+h+b/2),
+        "CENTER"    : (l+w/2, b+h/2),
     }[position.upper()]
 
-    # space padding and left trimming
-    def padAndTrim(b):
-        n, L = 0, b.split('\n')
-        for l in L: n = max(n, len(l))
-        p = f""
-        for l in L: p = f"{p}{l:<{n}}\n"
-        for l in p.split("\n"): # scan through each line
-            m = len(l) # record line length
-            if m: # skip empty lines
-                c = 0 # setup space counter
-                while c < m: # less thanend-of-line
-                    if not l[c]==" ": break # spaces not available
-                    c += 1 # increment space counter
-                n = min(n, c) # select minimum value
-        q = f"" # setup string
-        for l in p.split("\n"): # scan through each line
-            q = f"{q}\n{l[n:]}" # catenate trimmed lines
-        return q
-
     # instantiate text
-    tx = cfg().text(x, y, padAndTrim(text))
+    tx = cfg().text(x, y, FormatBlock(text))
     # setup fonts
     tx.set_fontfamily('monospace')
-    tx.set_fontsize("small")
+    tx.set_fontsize(fontsize)
     # setup alignment    
     tx.set_horizontalalignment('center')
     tx.set_verticalalignment('center')
@@ -401,6 +946,81 @@ def Text(text, position = "top"):
     # done
     return tx
 
+#################
+# page template #
+#################
+
+class PageTemplate():
+
+    """
+
+        PageTemplate(*styles[, texts][, xticks][, yticks]) builds a page
+        once: the axes, the grid, one line per style and the text blocks
+        at the positions given by texts. Every new page then only swaps
+        the line data, the limits and ticks, the labels and the strings:
+
+        page = PageTemplate(
+            (".b",), (".r",),
+            ("-.k", {"linewidth": 0.6}),
+            texts = ("top", "bottom"))
+
+        with StreamDocument("document.pdf") as doc:
+            for ... :
+                page.update((F, X), (F, Y), (F, XF), 
+                    texts = (headerText, fitText),
+                    xlabel = "Frequency / Hz")
+                doc.addpage(page.figure)
+
+        A style is a tuple of the plot() arguments, optionally followed
+        by a dictionary of keyword arguments (including the rasterize
+        and decimate options of Plot). The page is not registered as a
+        named figure.
+
+    """
+
+    def __init__(self, *styles, 
+            texts = ("top",),
+            xticks = 5,
+            yticks = 5,
+            size = "A4",
+            border = 15.0,
+            orientation = "portrait"):
+        self.figure, self.axes = MakeFigure(size, border, orientation)
+        self.xticks, self.yticks = xticks, yticks
+        with Handles(self.figure, self.axes):
+            self.lines, self.decimate = [], []
+            for style in styles:
+                args, kwargs = style, {}
+                if style and isinstance(style[-1], dict):
+                    args, kwargs = style[:-1], dict(style[-1])
+                # decimation is applied on update
+                decimate = kwargs.pop("decimate", None)
+                if decimate is True: decimate = _PixelColumns()
+                self.decimate.append(decimate)
+                self.lines += Plot([], [], *args, **kwargs)
+            AutoGrid()
+            self.texts = [Text("", position) for position in texts]
+        return
+
+    def update(self, *lines, texts = (), xlabel = None, ylabel = None):
+        with Handles(self.figure, self.axes):
+            # swap line data
+            for line, decimate, (x, y) in zip(self.lines, self.decimate, lines):
+                if decimate: x, y = Decimate(x, y, decimate)
+                line.set_data(x, y)
+            # limits and ticks
+            AutoRange("x", *[x for x, y in lines])
+            AutoRange("y", *[y for x, y in lines])
+            AutoTick("x", self.xticks)
+            AutoTick("y", self.yticks)
+            # labels
+            if xlabel is not None: Xlabel(xlabel)
+            if ylabel is not None: Ylabel(ylabel)
+        # strings
+        for tx, text in zip(self.texts, texts):
+            tx.set_text(FormatBlock(text))
+        return self.figure
+
 version_history["0.0"] = """
 version 0.0
 (13 december 2024):
@@ -433,6 +1053,157 @@ version 0.0
         Text(text[, position])
 """
 
+version_history["0.1"] = """
+version 0.1
+(17 october 2026):
+
+    Document incremental mode: only new or modified figures are
+    rendered by updatefile(), the cached pages are concatenated.
+
+        Document(pathname[, *figures][, incremental])
+        Document.touchfigure(name)
+        _readPdfObjects(data)
+        _catPdfPages(documents, fh)
+"""
+
+version_history["0.2"] = """
+version 0.2
+(17 october 2026):
+
+    StreamDocument: pages are appended to the open pdf file as soon as
+    the figure is added, then the figure is closed.
+
+        StreamDocument(pathname)
+        StreamDocument.addfigure(name)
+        StreamDocument.close()
+"""
+
+version_history["0.3"] = """
+version 0.3
+(17 october 2026):
+
+    Document incremental mode: finished figures can be frozen (the page
+    is kept, the figure is closed).
+
+        Document.freezefigure(name)
+"""
+
+version_history["0.4"] = """
+version 0.4
+(17 october 2026):
+
+    matplotlib.pyplot and the pdf backend are imported on first use.
+"""
+
+version_history["0.5"] = """
+version 0.5
+(17 october 2026):
+
+    pyplot is not used anymore: the figures are built with their own
+    Agg canvas and the named figures are registered in splotlib. The
+    current figure and axes are held by one Handles() instance.
+
+        MakeFigure([size][, border][, orientation])
+        Handles([fg][, ax])
+        CloseFigure(name)
+        FigureExists(name)
+"""
+
+version_history["0.6"] = """
+version 0.6
+(17 october 2026):
+
+    the current figure and axes are thread local: each thread selects
+    and builds its own figures with the same helper functions. Handles
+    is also a context manager that selects explicit handles.
+
+        Handles.__enter__(), Handles.__exit__()
+"""
+
+version_history["0.7"] = """
+version 0.7
+(17 october 2026):
+
+    page template: the axes, grid, lines and text blocks of a page are
+    built once, then only the line data, the ticks and the strings are
+    swapped for every new page.
+
+        PageTemplate(*styles[, texts][, xticks][, yticks][, size]...)
+        PageTemplate.update(*lines[, texts][, xlabel][, ylabel])
+        StreamDocument.addpage(fg)
+"""
+
+version_history["0.8"] = """
+version 0.8
+(17 october 2026):
+
+    pages rendered separately (e.g. by worker processes) are merged
+    in order into one document, without rendering them again.
+
+        RenderPage(fg)
+        CatPages(pathname, pages)
+"""
+
+version_history["0.9"] = """
+version 0.9
+(17 october 2026):
+
+    dense data: Plot() can rasterize a layer at a chosen resolution,
+    or plot only its min/max envelope per column (per pixel). The
+    other layers (e.g. the fit curves) stay vector paths.
+
+        Decimate(x, y, columns)
+        Plot(*args[, rasterize][, decimate], **kwargs)
+
+    the rasterize dpi is applied on saving only (the figure dpi is
+    unchanged).
+"""
+
+version_history["0.10"] = """
+version 0.10
+(17 october 2026):
+
+    GetUnitPrefix() and AutoRange() find the limits of the tables with
+    numpy (not with the built-in min and max). nan and inf values are
+    ignored, zero or missing data gives no prefix and a unit range.
+
+        _Limits(*tables)
+"""
+
+version_history["0.11"] = """
+version 0.11
+(17 october 2026):
+
+    text blocks are formatted in linear time (long header dumps), and
+    tables (e.g. the fit results of many sweeps) are formatted in
+    aligned columns. Text() takes a font size and a "center" position
+    (a full page table).
+
+        FormatBlock(text)
+        FormatTable(rows[, header][, separator])
+        Text(text[, position][, fontsize])
+"""
+
+version_history["0.12"] = """
+version 0.12
+(17 october 2026):
+
+    the paper sizes are computed once, and the tick positions used by
+    AutoTick() are memoized (bounded least recently used cache): the
+    pages of a uniform batch share the same layout.
+
+        TickLayout(start, stop, ticks)
+"""
+
+version_history["0.13"] = """
+version 0.13
+(17 october 2026):
+
+    the rendering and the writing of the pages are recorded as stages
+    by sproflib when enabled, with the bytes of each page (the fonts
+    are written when a document is closed: see its total size).
+"""
+
 #########
 # infos #
 #########
@@ -522,6 +1293,634 @@ if __name__ == "__main__":
         # update document
         doc.updatefile()
 
+    #############
+    # tests 0.1 #
+    #############
+
+    if "0.1" in TESTS:
+
+        lprint("running test version 0.1")
+
+        from time import perf_counter
+
+        # import data
+        try: # import from built
+            from fswp2pdf import sielib
+        except ImportError as error:
+            # local import
+            import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        # update the document after each new figure (live monitoring)
+        def build(pathname, n, incremental):
+            doc = Document(pathname, incremental = incremental)
+            for i in range(n):
+                name = f"fig{i}"
+                SelectFigure(name, "A4")
+                Plot(name, F, X, F, Y)
+                Text(f"page {i+1}", "top")
+                AutoStyle(F, X, Y)
+                doc.addfigure(name)
+                doc.updatefile()
+            # modify the first page and update again
+            SelectFigure("fig0")
+            Text("modified", "bottom")
+            doc.updatefile()
+            doc.close()
+            return
+
+        N = 10
+
+        t0 = perf_counter()
+        build("../.output/splotlib_full.pdf", N, False)
+        t1 = perf_counter()
+        build("../.output/splotlib_incremental.pdf", N, True)
+        t2 = perf_counter()
+
+        lprint()
+        lprint(f"benchmark:")
+        lprint(f"----------")
+        lprint(f"\t{N} pages, updated after each new page")
+        lprint(f"\tfull        : {t1-t0:8.3f} s")
+        lprint(f"\tincremental : {t2-t1:8.3f} s")
+
+    #############
+    # tests 0.2 #
+    #############
+
+    if "0.2" in TESTS:
+
+        lprint("running test version 0.2")
+
+        from tracemalloc import start, stop, get_traced_memory
+
+        # import data
+        try: # import from built
+            from fswp2pdf import sielib
+        except ImportError as error:
+            # local import
+            import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        lprint()
+        lprint(f"streaming document, peak memory:")
+        lprint(f"--------------------------------")
+
+        for N in [5, 20, 40]:
+            start()
+            with StreamDocument("../.output/splotlib_stream.pdf") as doc:
+                for i in range(N):
+                    name = f"fig{i}"
+                    SelectFigure(name, "A4")
+                    Plot(name, F, X, F, Y)
+                    Text(f"page {i+1}", "top")
+                    AutoStyle(F, X, Y)
+                    doc.addfigure(name)
+            size, peak = get_traced_memory()
+            stop()
+            lprint(f"\t{N:3} pages: {peak/1E6:6.1f} MB, open figures: {len(_Figures)}")
+
+    #############
+    # tests 0.3 #
+    #############
+
+    if "0.3" in TESTS:
+
+        lprint("running test version 0.3")
+
+
+        doc = Document("../.output/splotlib_frozen.pdf", incremental = True)
+        for i in range(30):
+            name = f"fig{i}"
+            SelectFigure(name, "A4")
+            Plot(name, [0, 1, 2], [i, 0, i])
+            Text(f"page {i+1}", "top")
+            doc.freezefigure(name)
+            doc.updatefile()
+
+        lprint()
+        lprint(f"frozen figures:")
+        lprint(f"---------------")
+        lprint(f"\tpages: {len(doc.pages)}, open figures: {len(_Figures)}")
+        doc.close()
+
+    #############
+    # tests 0.5 #
+    #############
+
+    if "0.5" in TESTS:
+
+        lprint("running test version 0.5")
+
+        from sys import modules
+
+        # explicit handles: no name, no registry, no current figure
+        fg, ax = MakeFigure("A5", orientation = "landscape")
+        ax.plot([0, 1, 2], [0, 1, 0])
+        fg.savefig("../.output/splotlib_makefigure.pdf")
+
+        # named figures through the helpers
+        with StreamDocument("../.output/splotlib_named.pdf") as doc:
+            for i in range(3):
+                SelectFigure(f"fig{i}")
+                Plot(f"fig{i}", [0, 1, 2], [i, 0, i])
+                Text(f"page {i+1}")
+                doc.addfigure(f"fig{i}")
+
+        lprint()
+        lprint(f"pyplot free figures:")
+        lprint(f"--------------------")
+        lprint(f"\tsize (inches)    : {fg.get_size_inches()}")
+        lprint(f"\tregistered       : {len(_Figures)}")
+        lprint(f"\tpyplot imported  : {'matplotlib.pyplot' in modules}")
+
+    #############
+    # tests 0.6 #
+    #############
+
+    if "0.6" in TESTS:
+
+        lprint("running test version 0.6")
+
+        from concurrent.futures import ThreadPoolExecutor
+        from numpy import array_equal
+
+        # import data
+        try: # import from built
+            from fswp2pdf import sielib
+        except ImportError as error:
+            # local import
+            import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        # sweep i is the test sweep shifted by i
+        def render(i):
+            name = f"thread sweep {i}"
+            SelectFigure(name)
+            Plot(name, F, X+i, ".b")
+            Xlabel(f"sweep {i}")
+            AutoStyle(F, X+i)
+            Text(f"page {i}", "top")
+            fg, ax = cfg(), cfa()
+            # page content
+            fh = BytesIO()
+            fg.savefig(fh, format = "pdf")
+            CloseFigure(name)
+            # check that all calls went to this figure
+            lines = ax.get_lines()
+            return all([
+                len(lines) == 1,
+                array_equal(lines[0].get_ydata(), X+i),
+                ax.get_xlabel() == f"sweep {i}",
+                [t.get_text().strip() for t in fg.texts] == [f"page {i}"],
+                ax.get_ylim()[0] < (X+i).min(),
+                fh.getvalue().startswith(b"%PDF"),
+                ])
+
+        N = 64
+        with ThreadPoolExecutor(8) as pool:
+            R = list(pool.map(render, range(N)))
+
+        # explicit handles in the main thread
+        fg, ax = MakeFigure()
+        with Handles(fg, ax):
+            Plot(F, Y, ".r")
+            AutoStyle(F, Y)
+
+        lprint()
+        lprint(f"thread stress test:")
+        lprint(f"-------------------")
+        lprint(f"\t{N} sweeps on 8 threads: {sum(R)} correct pages")
+        lprint(f"\texplicit handles: {len(ax.get_lines())} line, current restored: {cfa() is not ax}")
+
+    #############
+    # tests 0.7 #
+    #############
+
+    if "0.7" in TESTS:
+
+        lprint("running test version 0.7")
+
+        from time import perf_counter
+        from numpy import array_equal
+
+        # import data
+        try: # import from built
+            from fswp2pdf import sielib
+        except ImportError as error:
+            # local import
+            import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        # sweep i is the test sweep scaled by (1+i/10)
+        def sweep(i):
+            return F, X*(1+i/10), Y*(1+i/10), f"sweep {i}\n  scale {1+i/10}"
+
+        # build page i from scratch
+        def rebuild(i):
+            F, X, Y, t = sweep(i)
+            fg, ax = SelectFigure("rebuild")
+            Plot("rebuild", F, X, ".b")
+            Plot("rebuild", F, Y, ".r")
+            Xlabel("Frequency / Hz")
+            AutoRange("x", F)
+            AutoRange("y", X, Y)
+            AutoTick("x")
+            AutoTick("y")
+            AutoGrid()
+            Text(t, "top")
+            return fg, ax
+
+        # template page
+        page = PageTemplate((".b",), (".r",), texts = ("top",))
+        def update(i):
+            F, X, Y, t = sweep(i)
+            page.update((F, X), (F, Y), texts = (t,), xlabel = "Frequency / Hz")
+            return page.figure, page.axes
+
+        # compare contents
+        same = True
+        for i in [3, 1, 7]:
+            fr, ar = rebuild(i)
+            ft, at = update(i)
+            same &= all([
+                array_equal(ar.get_xticks(), at.get_xticks()),
+                array_equal(ar.get_yticks(minor = True), at.get_yticks(minor = True)),
+                ar.get_ylim() == at.get_ylim(),
+                array_equal(ar.get_lines()[1].get_ydata(), at.get_lines()[1].get_ydata()),
+                ar.get_xlabel() == at.get_xlabel(),
+                fr.texts[0].get_text() == ft.texts[0].get_text(),
+                all([g.get_visible() for g in at.xaxis.get_gridlines()]),
+                ])
+            CloseFigure("rebuild")
+
+        lprint()
+        lprint(f"page template:")
+        lprint(f"--------------")
+        lprint(f"\tsame content as rebuilt pages: {same}")
+
+        # pages per second (into a pdf document in memory)
+        N = 40
+        fh = BytesIO()
+        with StreamDocument(fh) as doc:
+            t = perf_counter()
+            for i in range(N):
+                rebuild(i)
+                doc.addfigure("rebuild")
+            tr = perf_counter()-t
+        fh = BytesIO()
+        with StreamDocument(fh) as doc:
+            t = perf_counter()
+            for i in range(N):
+                doc.addpage(update(i)[0])
+            tt = perf_counter()-t
+
+        lprint(f"\trebuild : {N/tr:6.1f} pages/s")
+        lprint(f"\ttemplate: {N/tt:6.1f} pages/s")
+
+    #############
+    # tests 0.8 #
+    #############
+
+    if "0.8" in TESTS:
+
+        lprint("running test version 0.8")
+
+        from time import perf_counter
+        from zlib import decompress
+
+        # import data
+        try: # import from built
+            from fswp2pdf import sielib
+        except ImportError as error:
+            # local import
+            import sielib
+
+        fp = "../.data/fswp_full_1.dat"
+
+        info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+        T, F, X, Y = data
+
+        page = PageTemplate((".b",), (".r",), texts = ("top",))
+        def update(i):
+            k = 1+i/10
+            page.update((F, X*k), (F, Y*k), texts = (f"sweep {i}",))
+            return page.figure
+
+        # decompressed content streams of the pages of a document
+        def contents(data):
+            h, O, root, info = _readPdfObjects(data)
+            tree = int(search(rb"/Pages (\d+) 0 R", O[root]).group(1))
+            kids = search(rb"/Kids \[([^\]]*)\]", O[tree]).group(1)
+            C = []
+            for i in findall(rb"(\d+) 0 R", kids):
+                c = int(search(rb"/Contents (\d+) 0 R", O[int(i)]).group(1))
+                stream = O[c].partition(b"stream")[2].lstrip(b"\r\n")
+                stream = decompress(stream[:stream.rindex(b"endstream")])
+                # the marker names are numbered per document
+                C.append(recompile(rb"/M\d+ Do").sub(b"/M Do", stream))
+            return C
+
+        N = 20
+
+        # serial document
+        fh = BytesIO()
+        t = perf_counter()
+        with StreamDocument(fh) as doc:
+            for i in range(N):
+                doc.addpage(update(i))
+        ts = perf_counter()-t
+
+        # separate pages, then merged
+        t = perf_counter()
+        pages = [RenderPage(update(i)) for i in range(N)]
+        CatPages("../.output/splotlib-catpages.pdf", pages)
+        tc = perf_counter()-t
+
+        A = contents(fh.getvalue())
+        B = contents(open("../.output/splotlib-catpages.pdf", "rb").read())
+
+        lprint()
+        lprint(f"merged pages:")
+        lprint(f"-------------")
+        lprint(f"\t{len(B)} pages, same as streamed document: {A == B}")
+        lprint(f"\tstreamed: {N/ts:6.1f} pages/s")
+        lprint(f"\tmerged  : {N/tc:6.1f} pages/s")
+
+        # growing document: one page appended at a time
+        M, fp = 10*N, "../.output/splotlib-growing.pdf"
+        if exists(fp): remove(fp)
+        doc, t, T1 = CatDocument(fp), perf_counter(), []
+        for i in range(M):
+            doc.addpage(pages[i % N])
+            T1.append(perf_counter()-t)
+        # previous way: the whole document read and merged again
+        document, t, T2 = None, perf_counter(), []
+        for i in range(M):
+            CatPages(fp+".old", [document, pages[i % N]] if document else [pages[i % N]])
+            with open(fp+".old", "rb") as fh: document = fh.read()
+            T2.append(perf_counter()-t)
+        remove(fp+".old")
+        # continued from the file
+        doc = CatDocument(fp)
+        doc.load()
+        doc.addpage(pages[0])
+        C = contents(open(fp, "rb").read())
+        lprint(f"\t{M} pages appended one at a time, {doc.pages} pages after load(): "
+            f"{C[:N] == B and C[-1] == B[0]}")
+        lprint(f"\tlast {N} pages: {(T1[-1]-T1[-N-1])/N*1E3:.1f} ms/page "
+            f"(whole document merged again: {(T2[-1]-T2[-N-1])/N*1E3:.1f} ms/page)")
+
+    #############
+    # tests 0.9 #
+    #############
+
+    if "0.9" in TESTS:
+
+        lprint("running test version 0.9")
+
+        from time import perf_counter
+        from numpy.random import default_rng
+
+        # long synthetic sweep: lorentzian and noise
+        N = 200000
+        F = linspace(87.0, 89.0, N)
+        XF = 1E-4/(1.0+((F-88.0)/0.05)**2)
+        X = XF + default_rng(1).normal(0.0, 3E-6, N)
+
+        # the envelope keeps the extrema of each column
+        x, y = Decimate(F, X, 500)
+        b = ((F-F.min())*(500/(F.max()-F.min()))).astype(int).clip(0, 499)
+        kb = ((x-F.min())*(500/(F.max()-F.min()))).astype(int).clip(0, 499)
+        keep = all([
+            y.max() == X.max(), y.min() == X.min(),
+            x[0] == F[0], x[-1] == F[-1],
+            X[b == 250].max() == y[kb == 250].max(),
+            X[b == 250].min() == y[kb == 250].min(),
+            len(x) <= 4*500,
+            ])
+
+        lprint()
+        lprint(f"dense data:")
+        lprint(f"-----------")
+        lprint(f"\tenvelope of {N} points: {len(x)} points, extrema kept: {keep}")
+
+        # data layer as vectors, rasterized, or decimated
+        for name, options in [
+                ("vector", {}),
+                ("rasterize 300 dpi", {"rasterize": 300}),
+                ("decimate per pixel", {"decimate": True}),
+                ]:
+            t = perf_counter()
+            fg, ax = MakeFigure()
+            with Handles(fg, ax):
+                Plot(F, X, ".b", **options)
+                Plot(F, XF, "-.k", linewidth = 0.6)
+                AutoStyle(F, X)
+            size = len(RenderPage(fg))
+            t = perf_counter()-t
+            lprint(f"\t{name:<20}: {size/1E6:7.3f} MB {t:6.2f} s")
+
+        # the rasterize dpi does not change the figure (dpi, pixel columns)
+        fg, ax = MakeFigure()
+        with Handles(fg, ax):
+            dpi, columns = fg.dpi, _PixelColumns()
+            Plot(F, X, ".b", rasterize = 300)
+            Plot(F, X, ".r", decimate = True)
+            lprint(f"\tfigure unchanged    : {fg.dpi == dpi and _PixelColumns() == columns}")
+            s1 = len(RenderPage(fg))
+            Plot(F, X, ".g", rasterize = 72)
+            lprint(f"\thighest dpi kept    : {_RasterDpi[fg]}, {len(RenderPage(fg)) > s1}")
+
+        # rasterize = True: the figure resolution
+        fg, ax = MakeFigure()
+        with Handles(fg, ax):
+            Plot(F, X, ".b", rasterize = True)
+            lprint(f"\trasterize = True    : {_RasterDpi[fg]} dpi (figure {fg.dpi} dpi)")
+
+        # every (x, y) pair is decimated
+        fg, ax = MakeFigure()
+        with Handles(fg, ax):
+            L = Plot(F, X, ".b", F, XF, "-k", F, 2*X, decimate = 500)
+            lprint(f"\tthree pairs decimated: {[len(l.get_xdata()) for l in L]} points")
+
+    ##############
+    # tests 0.10 #
+    ##############
+
+    if "0.10" in TESTS:
+
+        lprint("running test version 0.10")
+
+        from timeit import timeit
+        from numpy import nan, zeros
+        from numpy.random import default_rng
+
+        # edge cases
+        lprint()
+        lprint(f"limits and prefixes:")
+        lprint(f"--------------------")
+        for name, tables in [
+                ("zeros", [zeros(10)]),
+                ("nan, inf", [[nan, 2E-6, inf], [-3E-6, -inf]]),
+                ("only nan", [[nan, nan]]),
+                ("empty", [[], [5E3]]),
+                ("scalars", [[1.5E-13, 2E-13]]),
+                ]:
+            fg, ax = MakeFigure()
+            with Handles(fg, ax):
+                AutoRange("y", *tables)
+            lprint(f"\t{name:<10}: limits {_Limits(*tables)}, prefix {GetUnitPrefix(*tables)}, ylim {[float(v) for v in ax.get_ylim()]}")
+
+        # micro-benchmark on 1E6 points tables
+        X, Y = default_rng(2).normal(0.0, 1E-6, (2, 1000000))
+
+        def builtinLimits(*tables):
+            # the previous search (python built-in min and max)
+            S, E = min(tables[0]), max(tables[0])
+            for T in tables[1:]:
+                s, e = min(T), max(T)
+                S, E = min(S, s), max(E, e)
+            return S, E
+
+        n = 5
+        tb = timeit(lambda: builtinLimits(X, Y), number = n)/n
+        tn = timeit(lambda: _Limits(X, Y), number = n)/n
+        Y[10] = nan
+        tf = timeit(lambda: _Limits(X, Y), number = n)/n
+
+        lprint()
+        lprint(f"\ttwo tables of 1E6 points:")
+        lprint(f"\tbuilt-in min, max : {tb*1E3:8.3f} ms")
+        lprint(f"\tnumpy             : {tn*1E3:8.3f} ms")
+        lprint(f"\tnumpy (with a nan): {tf*1E3:8.3f} ms")
+
+    ##############
+    # tests 0.11 #
+    ##############
+
+    if "0.11" in TESTS:
+
+        lprint("running test version 0.11")
+
+        from timeit import timeit
+        from numpy.random import default_rng
+
+        def padAndTrim(b):
+            # the previous (quadratic) formatting
+            n, L = 0, b.split('\n')
+            for l in L: n = max(n, len(l))
+            p = f""
+            for l in L: p = f"{p}{l:<{n}}\n"
+            for l in p.split("\n"):
+                m = len(l)
+                if m:
+                    c = 0
+                    while c < m:
+                        if not l[c]==" ": break
+                        c += 1
+                    n = min(n, c)
+            q = f""
+            for l in p.split("\n"):
+                q = f"{q}\n{l[n:]}"
+            return q
+
+        # same output on random blocks (spaces, empty lines, text)
+        rng = default_rng(3)
+        def block(lines):
+            return "\n".join(" "*rng.integers(0, 12) + "x"*rng.integers(0, 30)
+                for i in range(lines))
+        B = [block(rng.integers(1, 20)) for i in range(500)] + ["", "\n\n", "   \n  "]
+        same = all([FormatBlock(b) == padAndTrim(b) for b in B])
+
+        lprint()
+        lprint(f"text blocks:")
+        lprint(f"------------")
+        lprint(f"\tsame output as before on {len(B)} blocks: {same}")
+        for n in [100, 1000, 10000]:
+            b = block(n)
+            t0 = timeit(lambda: padAndTrim(b), number = 3)/3
+            t1 = timeit(lambda: FormatBlock(b), number = 3)/3
+            lprint(f"\t{n:6} lines: before {t0*1E3:9.3f} ms, now {t1*1E3:7.3f} ms")
+
+        lprint()
+        lprint(FormatTable([[1, "a", 2.5], [10, "bcd", -1.0]], ["n", "name", "value"]))
+
+    ##############
+    # tests 0.12 #
+    ##############
+
+    if "0.12" in TESTS:
+
+        lprint("running test version 0.12")
+
+        from timeit import timeit
+        from numpy import array_equal
+        from numpy.random import default_rng
+
+        # same positions as the direct computation
+        rng = default_rng(4)
+        L = [(s, s+d, t) for s, d, t in zip(
+            rng.normal(0.0, 100.0, 1000),
+            10.0**rng.uniform(-3, 3, 1000),
+            rng.integers(3, 9, 1000))]
+        same = True
+        for s, e, t in L:
+            M, S = TickLayout(s, e, t)
+            m, n = _getTickPositions(s, e, t)
+            same &= array_equal(M, m) and array_equal(S, n)
+
+        lprint()
+        lprint(f"tick layout:")
+        lprint(f"------------")
+        lprint(f"\tsame positions on {len(L)} random limits: {same}")
+        lprint(f"\tcache: {_cachedTickPositions.cache_info()}")
+
+        # per call
+        n = 2000
+        t0 = timeit(lambda: _getTickPositions(87.9, 88.7, 5), number = n)/n
+        t1 = timeit(lambda: TickLayout(87.9, 88.7, 5), number = n)/n
+        t2 = timeit(lambda: AClass().PaperSize("A4"), number = n)/n
+        t3 = timeit(lambda: _PaperSizes["A4"], number = n)/n
+        lprint(f"\ttick positions : {t0*1E6:6.1f} us, memoized {t1*1E6:6.1f} us")
+        lprint(f"\tpaper size     : {t2*1E6:6.1f} us, table    {t3*1E6:6.1f} us")
+
+        # per page of a uniform batch (two axes, one new figure)
+        F, X = linspace(87.9, 88.7, 500), linspace(-1.0, 1.0, 500)
+        def page(layout):
+            fg, ax = MakeFigure()
+            with Handles(fg, ax):
+                AutoRange("x", F)
+                AutoRange("y", X)
+                for a in "xy":
+                    s, e = {"x": ax.get_xlim, "y": ax.get_ylim}[a]()
+                    M, S = layout(s, e, 5)
+                    {"x": ax.set_xticks, "y": ax.set_yticks}[a](M)
+                    {"x": ax.set_xticks, "y": ax.set_yticks}[a](S, minor = True)
+            return fg
+        n = 20
+        page(TickLayout) # (warm up)
+        t0 = timeit(lambda: page(_getTickPositions), number = n)/n
+        t1 = timeit(lambda: page(TickLayout), number = n)/n
+        tr = timeit(lambda: RenderPage(page(TickLayout)), number = 5)/5
+        lprint(f"\tpage layout    : {t0*1E3:6.2f} ms, memoized {t1*1E3:6.2f} ms (rendered page {tr*1E3:.0f} ms)")
+
     #############
     # tests x.x #
     #############
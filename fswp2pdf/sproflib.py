@@ -0,0 +1,280 @@
+# file: sproflib.py
+# content: timing and profiling instrumentation of the package modules
+# Created: 17 October 2026
+# Author: Roch Schanen
+# comments: disabled by default, enabled by the scripts on request
+
+version_history = {}
+
+"""
+
+    sielib, sfitlib and splotlib record their stages (import, fit,
+    page rendering and writing) with Stage(). Nothing is recorded until
+    Enable(pathname) is called: one line of json is then written per
+    stage (name, wall and cpu time, and the fields of the stage, e.g.
+    the number of fit iterations or the bytes per page). Disable()
+    writes the totals of the run and closes the log.
+
+        Enable("document.jsonl", profile = True)
+        ...
+        Disable()
+
+    With profile = True, the run is also profiled by cProfile and the
+    statistics are dumped next to the log ("document.prof").
+
+    Without a pathname, the records are kept in memory and collected
+    with Records(), e.g. to be sent back by a worker process and then
+    written to the log of the parent process.
+
+"""
+
+# built-in imports
+# ----------------
+from json import dumps
+from time import perf_counter
+from time import process_time
+from time import strftime
+from threading import Lock
+from os import getpid
+from os import times
+
+################
+# module state #
+################
+
+# log file handle, or list of records (None: disabled)
+_Log = None
+_LogLock = Lock()
+
+# run start and profiler
+_Run = None
+
+##########
+# Enable #
+##########
+
+def Enable(pathname = None, profile = False):
+    global _Log, _Run
+    Disable()
+    # line buffered (worker processes may exit without closing files)
+    _Log = open(pathname, "w", buffering = 1) if pathname else []
+    _Run = {
+        "pathname"  :   pathname,
+        "pid"       :   getpid(),
+        "wall"      :   perf_counter(),
+        "cpu"       :   process_time(),
+        "profile"   :   None,
+        }
+    if pathname: Record("start", date = strftime("%Y-%m-%d %H:%M:%S"))
+    if profile and pathname:
+        from cProfile import Profile
+        _Run["profile"] = Profile()
+        _Run["profile"].enable()
+    return
+
+def Disable():
+    global _Log, _Run
+    if _Log is None: return
+    # a log inherited by a forked process is left to its parent
+    if _Run["pid"] != getpid():
+        _Log, _Run = None, None
+        return
+    fields = {}
+    if _Run["profile"]:
+        _Run["profile"].disable()
+        fields["profile"] = _Run["pathname"].rsplit(".", 1)[0]+".prof"
+        _Run["profile"].dump_stats(fields["profile"])
+    Record("run",
+        wall = perf_counter()-_Run["wall"],
+        cpu = process_time()-_Run["cpu"],
+        **fields)
+    if not isinstance(_Log, list): _Log.close()
+    _Log, _Run = None, None
+    return
+
+def Enabled():
+    return _Log is not None
+
+##########
+# Record #
+##########
+
+def Record(stage, **fields):
+    # write one line of json (when enabled)
+    if _Log is None: return
+    if isinstance(_Log, list):
+        _Log.append({"stage": stage, **fields})
+        return
+    line = dumps({"stage": stage, **fields}, default = str)
+    with _LogLock:
+        _Log.write(line + "\n")
+    return
+
+def Records():
+    # collect the records kept in memory (and clear them)
+    if not isinstance(_Log, list): return []
+    with _LogLock:
+        R = _Log[:]
+        del _Log[:]
+    return R
+
+class Stage():
+
+    """
+
+        time a stage (wall and cpu time of the process) and record it
+        with its fields on exit. Fields can be added during the stage:
+
+        with Stage("fit", file = fp) as st:
+            ...
+            st.set(nfev = n)
+
+        A stage stopped by an exception records the error. When
+        disabled, nothing is recorded. The times are kept in st.wall
+        and st.cpu after the stage. With children = True, the cpu time
+        includes the child processes that have terminated and have been
+        waited for (e.g. subprocess.run(), zero on Windows).
+
+    """
+
+    def __init__(self, name, children = False, **fields):
+        self.name, self.fields, self.children = name, fields, children
+        self.wall, self.cpu = None, None
+        return
+
+    def _cpu(self):
+        if self.children: return sum(times()[:4])
+        return process_time()
+
+    def __enter__(self):
+        self.wall, self.cpu = perf_counter(), self._cpu()
+        return self
+
+    def set(self, **fields):
+        self.fields.update(fields)
+        return
+
+    def __exit__(self, kind, value, traceback):
+        self.wall, self.cpu = perf_counter()-self.wall, self._cpu()-self.cpu
+        if _Log is None: return False
+        if kind: self.fields["error"] = f"{kind.__name__}: {value}"
+        Record(self.name, wall = self.wall, cpu = self.cpu, **self.fields)
+        return False
+
+version_history["0.0"] = """
+version 0.0
+(17 october 2026):
+
+    implemented:
+
+        Enable([pathname][, profile])
+        Disable()
+        Enabled()
+        Record(stage, **fields)
+        Records()
+        Stage(name, **fields)
+        Stage.set(**fields)
+"""
+
+#########
+# infos #
+#########
+
+if __name__ == "__main__":
+
+    _fp = "../.output/sproflib.txt"
+    _fh = open(_fp, "w")
+    def lprint(*args, **kwargs):
+        print(*args, **kwargs)
+        kwargs["file"] = _fh
+        return print(*args, **kwargs)
+
+    ###  display version ###
+
+    current_version = list(version_history.keys())[-1]
+
+    lprint(f"sproflib current version: {current_version}")
+    lprint(f"--------------------------")
+
+    lprint()
+    lprint(f"history")
+    lprint(f"-------")
+    for v in version_history.values():
+        lprint(v)
+
+    # test list
+    TESTS = [current_version]
+
+    #############
+    # tests 0.0 #
+    #############
+
+    if "0.0" in TESTS:
+
+        lprint("running test version 0.0")
+
+        from timeit import timeit
+        from numpy.random import default_rng
+
+        import sielib
+        import sfitlib
+        import splotlib
+
+        # the module used by the libraries (not this __main__ module)
+        import sproflib
+
+        fp = "../.data/fswp_full_1.dat"
+
+        def convert():
+            info, data = sielib.import_TorsionOscilla_FreqScan_20241213_112400(fp)
+            T, F, X, Y = data
+            (pAbs, pAbsCov, XF), (pDis, pDisCov, YF) = sfitlib.LorentzFit(F, X, Y)
+            rng = default_rng(0)
+            sfitlib.LorentzBatchFit(F, X + rng.normal(0.0, 3E-6, (20, X.size)),
+                Y + rng.normal(0.0, 3E-6, (20, Y.size)))
+            fg, ax = splotlib.MakeFigure()
+            ax.plot(F, X, ".b")
+            return splotlib.RenderPage(fg)
+
+        # one instrumented and profiled run
+        sproflib.Enable("../.output/sproflib.jsonl", profile = True)
+        convert()
+        doc = splotlib.StreamDocument("../.output/sproflib.pdf")
+        fg, ax = splotlib.MakeFigure()
+        doc.addpage(fg)
+        doc.addpage(fg)
+        doc.close()
+        sproflib.Disable()
+
+        # records in memory (worker processes)
+        sproflib.Enable()
+        convert()
+        R = sproflib.Records()
+        sproflib.Disable()
+
+        lprint()
+        lprint(f"in memory: {[r['stage'] for r in R]}")
+
+        lprint()
+        lprint(f"log:")
+        lprint(f"----")
+        for line in open("../.output/sproflib.jsonl"):
+            lprint(f"\t{line.strip()}")
+
+        # overhead of a disabled stage
+        n = 100000
+        def stage():
+            with sproflib.Stage("test", value = 1): pass
+        t = timeit(stage, number = n)/n
+        lprint()
+        lprint(f"\tdisabled stage: {t*1E9:.0f} ns")
+        t0 = timeit(convert, number = 5)/5
+        lprint(f"\tdisabled run  : {t0*1E3:.2f} ms (import, fit, batch fit, page)")
+
+        # times kept when disabled, with the cpu time of a child process
+        from sys import executable
+        from subprocess import run
+        child = [executable, "-c", "sum(range(10**7))"]
+        with sproflib.Stage("child") as st: run(child)
+        with sproflib.Stage("child", children = True) as sc: run(child)
+        lprint(f"\tchild process : cpu {st.cpu:.3f} s (process), {sc.cpu:.3f} s (with children)")
@@ -0,0 +1,360 @@
+#
+# file: fswpbenchmark.py
+# content: benchmark of the import, fit, render and write stages
+# created: 2026 October 17, Saturday
+# author: roch schanen
+# modified: 2026 October 17, Saturday
+# modification: argparse options, stages timed with sproflib.Stage
+# comment: Set debug "True" to run the script from sublime text
+
+"""
+    usage: fswpbenchmark.py [options]
+
+    options:
+
+        --points N      number of points per sweep (default 100)
+        --sweeps M      number of sweeps (default 50)
+        --folder FP     folder of the synthetic sweeps (default: a temporary
+                        folder, removed at the end)
+        --output FP     results file (default "./fswp2pdf-benchmark.jsonl")
+
+    Synthetic lorentzian sweeps (absorption, dispersion and noise) are
+    written in the "Fsweep" data file format. Then each stage is timed
+    separately (wall and cpu time):
+
+        first use       loading of scipy and matplotlib (first sweep)
+        import          sielib import of all the files
+        start           sfitlib start parameters
+        fit             sfitlib fit of each sweep
+        batch fit       sfitlib batch fit of the stack of sweeps
+        page            splotlib page construction (helper functions)
+        write           PdfPages write of all the pages
+        template        splotlib page construction (page template)
+        template write  page template updates written to PdfPages
+
+    and end-to-end, the three scripts are run on the files (first with
+    an empty fit results cache, then with the cache filled; the single
+    plot script does not use the cache: it is run once). The temporary
+    folder is removed, even when a stage fails.
+
+    One line of json is appended to the results file per run: the
+    date, the options, the versions of the modules and of the packages
+    and the times of each stage (total and per sweep), so that the runs
+    of different versions can be compared.
+"""
+
+_DEBUG = False
+
+#######
+# LOG #
+#######
+
+# log path
+_fp = "./benchmark.log"
+
+# log handle
+_fh = open(_fp, "w") if _DEBUG else None
+
+def lprint(*args, **kwargs):
+    # print(*args, **kwargs)
+    kwargs["file"] = _fh
+    return print(*args, **kwargs)
+
+###########
+# IMPORTS #
+###########
+
+# built-in imports
+# ----------------
+from sys import argv
+from sys import executable
+from sys import version as python_version
+from os import environ
+from os import remove
+from os import pathsep
+from os.path import join
+from os.path import exists
+from os.path import abspath
+from os.path import dirname
+from json import dumps
+from time import strftime
+from argparse import ArgumentParser
+from tempfile import mkdtemp
+from shutil import rmtree
+from subprocess import run
+from subprocess import DEVNULL
+
+# imports from package "https://numpy.org/"
+# -----------------------------------------
+import numpy
+from numpy import linspace
+from numpy import stack
+from numpy.random import default_rng
+
+# imports from package "https://matplotlib.org/"
+# ----------------------------------------------
+import matplotlib
+matplotlib.use("Agg")
+
+# from the local package
+# ----------------------
+try:
+
+    # import from built
+    # -----------------
+    from fswp2pdf import sielib
+    from fswp2pdf import splotlib
+    from fswp2pdf import sfitlib
+    from fswp2pdf import sproflib
+
+except ImportError as error:
+
+    # import from .
+    # -------------
+    import sielib
+    import splotlib
+    import sfitlib
+    import sproflib
+
+#########
+# DEBUG #
+#########
+
+if _DEBUG:
+    argv = [
+        f"scriptname",
+        f"--sweeps", f"10",
+        ]
+
+###########
+# OPTIONS #
+###########
+
+def _parser():
+    p = ArgumentParser(prog = "fswpbenchmark.py",
+        description = "benchmark of the import, fit, render and write stages")
+    p.add_argument("--points", type = int, default = 100,
+        help = "number of points per sweep")
+    p.add_argument("--sweeps", type = int, default = 50,
+        help = "number of sweeps")
+    p.add_argument("--folder", default = None,
+        help = "folder of the synthetic sweeps (default: a temporary folder, removed at the end)")
+    p.add_argument("--output", default = "./fswp2pdf-benchmark.jsonl",
+        help = "results file")
+    return p
+
+def _options(args):
+    options = vars(_parser().parse_args(args))
+    options["temporary"] = options["folder"] is None
+    if options["temporary"]:
+        options["folder"] = mkdtemp(prefix = "fswp2pdf-benchmark-")
+    return options
+
+###########
+# PROCESS #
+###########
+
+def synthetic(folder, points, sweeps, seed = 0):
+
+    """
+        write sweeps synthetic data files in the folder and return their
+        paths (in order). The resonance drifts slowly from file to file.
+    """
+
+    rng = default_rng(seed)
+    F = linspace(88.044, 89.000, points)
+    files = []
+    for i in range(sweeps):
+        # lorentzian: position, width, height, offsets
+        p, w, h = 88.3+1E-4*i, 0.048, 5.0E-4
+        z = (F-p)/w
+        X = h/(1.0+z*z) + rng.normal(0.0, 3E-6, points)
+        Y = 3.5E-4 - h*z/(1.0+z*z) + rng.normal(0.0, 3E-6, points)
+        T = 3.8172986885E+9 + 30.0*points*i + linspace(0.0, 8.0*points, points)
+        s = 60525+i*30*points//100
+        header = (f"% Fsweep {i+1}  at:\t17/12/2024\t"
+            f"{s//3600%24:02}:{s//60%60:02}:{s%60:02}\t"
+            f"drive_mV 7000.000000\tDVM  0.000000\n"
+            f"freq\tVx\tVy\ttime\n")
+        rows = "\n".join([f"{f:.10E}\t{x:.10E}\t{y:.10E}\t{t:.10E}"
+            for f, x, y, t in zip(F, X, Y, T)])
+        fp = join(folder, f"BENCH_full_{i+1}.dat")
+        with open(fp, "w") as fh:
+            fh.write(header + rows + "\n")
+        files.append(fp)
+    return files
+
+class _Stage(sproflib.Stage):
+
+    """ 
+        time a stage (wall and cpu, including the child processes) and
+        record it in results
+    """
+
+    def __init__(self, results, name, count):
+        sproflib.Stage.__init__(self, name, children = True, sweeps = count)
+        self.results, self.count = results, count
+        return
+
+    def __exit__(self, *args):
+        sproflib.Stage.__exit__(self, *args)
+        self.results[self.name] = {
+            "wall"      :   self.wall,
+            "cpu"       :   self.cpu,
+            "per_sweep" :   self.wall/self.count,
+            }
+        lprint(f"\t{self.name:<36}: {self.wall:8.3f} s, {self.wall/self.count*1E3:8.2f} ms per sweep")
+        return False
+
+def stages(files, results):
+
+    M = len(files)
+
+    # first sweep (the packages loaded on first use: scipy.optimize,
+    # the figure classes and the pdf backend), not in the other stages
+    with _Stage(results, "first use", 1):
+        info, (T, F, X, Y) = sielib.import_TorsionOscilla_FreqScan_20241213_112400(files[0])
+        sfitlib.LorentzFit(F, X, Y)
+        fg, ax = splotlib.MakeFigure()
+        ax.plot(F, X, ".b")
+        splotlib.RenderPage(fg)
+
+    # import
+    with _Stage(results, "import", M):
+        D = [sielib.import_TorsionOscilla_FreqScan_20241213_112400(a) for a in files]
+
+    # start parameters
+    with _Stage(results, "start", M):
+        for info, (T, F, X, Y) in D:
+            sfitlib.LorentzAbsorptionFit_Estimate(F, X)
+            sfitlib.LorentzDispersionFit_Estimate(F, Y)
+
+    # fit
+    with _Stage(results, "fit", M):
+        R = [sfitlib.LorentzFit(F, X, Y) for info, (T, F, X, Y) in D]
+
+    # batch fit (the sweeps have the same frequencies)
+    F = D[0][1][1]
+    XS = stack([X for info, (T, F, X, Y) in D])
+    YS = stack([Y for info, (T, F, X, Y) in D])
+    with _Stage(results, "batch fit", M):
+        sfitlib.LorentzBatchFit(F, XS, YS)
+
+    # page construction, helper functions
+    with _Stage(results, "page", M):
+        names = []
+        for (info, (T, F, X, Y)), ((pAbs, c, XF), (pDis, d, YF)) in zip(D, R):
+            fn = info["filename"]
+            splotlib.SelectFigure(fn)
+            splotlib.Plot(fn, F, X, ".b")
+            splotlib.Plot(fn, F, Y, ".r")
+            splotlib.Plot(fn, F, XF, "-.k", linewidth = 0.6)
+            splotlib.Plot(fn, F, YF, "-.k", linewidth = 0.6)
+            splotlib.AutoRange("x", F)
+            splotlib.AutoRange("y", X, Y, XF, YF)
+            splotlib.AutoTick("x")
+            splotlib.AutoTick("y")
+            splotlib.AutoGrid()
+            splotlib.Text(f"{info}", "top")
+            splotlib.Text(sfitlib.LorentzFitParametersDisplay(pAbs, pDis), "bottom")
+            names.append(fn)
+
+    # PdfPages write
+    fp = join(dirname(files[0]), "benchmark-write.pdf")
+    with _Stage(results, "write", M):
+        with splotlib.StreamDocument(fp) as doc:
+            for fn in names:
+                doc.addfigure(fn)
+
+    # page construction, template (and write)
+    page = splotlib.PageTemplate(
+        (".b",), (".r",),
+        ("-.k", {"linewidth": 0.6}),
+        ("-.k", {"linewidth": 0.6}),
+        texts = ("top", "bottom"))
+    with _Stage(results, "template", M):
+        for (info, (T, F, X, Y)), ((pAbs, c, XF), (pDis, d, YF)) in zip(D, R):
+            page.update((F, X), (F, Y), (F, XF), (F, YF), texts = (f"{info}",
+                sfitlib.LorentzFitParametersDisplay(pAbs, pDis)))
+    with _Stage(results, "template write", M):
+        with splotlib.StreamDocument(fp) as doc:
+            for (info, (T, F, X, Y)), ((pAbs, c, XF), (pDis, d, YF)) in zip(D, R):
+                doc.addpage(page.update((F, X), (F, Y), (F, XF), (F, YF),
+                    texts = (f"{info}", sfitlib.LorentzFitParametersDisplay(pAbs, pDis))))
+    remove(fp)
+
+    # done
+    return
+
+def scripts(files, results):
+
+    M, folder = len(files), dirname(files[0])
+
+    # the scripts import the package from the parent folder
+    here = dirname(abspath(__file__))
+    env = dict(environ)
+    env["PYTHONPATH"] = pathsep.join([dirname(here), here, env.get("PYTHONPATH", "")])
+    env["MPLBACKEND"] = "Agg"
+
+    cache = join(folder, "fswp2pdf-cache.json")
+    for name, modes in [
+            ("fswptosinglepagepdf.py", ["", " (cached fit)"]),
+            ("fswptosingledocumentpdf.py", ["", " (cached fit)"]),
+            ("fswptosingleplotpdf.py", [""]),
+            ]:
+        # empty fit results cache, then filled (the single plot script
+        # does not fit: run once)
+        if exists(cache): remove(cache)
+        for mode in modes:
+            with _Stage(results, f"{name[:-3]}{mode}", M):
+                run([executable, join(here, name), *files], cwd = folder, env = env,
+                    stdout = DEVNULL, check = True)
+    if exists(cache): remove(cache)
+
+    # done
+    return
+
+def benchmark(options):
+
+    lprint(f"synthetic sweeps: {options['sweeps']} x {options['points']} points in {options['folder']}")
+
+    results = {}
+    try:
+        files = synthetic(options["folder"], options["points"], options["sweeps"])
+        lprint(f"stages:")
+        stages(files, results)
+        lprint(f"scripts:")
+        scripts(files, results)
+    finally:
+        # the temporary folder is removed, even when a stage fails
+        if options["temporary"]: rmtree(options["folder"])
+
+    # one json line per run
+    record = {
+        "date"      :   strftime("%Y-%m-%d %H:%M:%S"),
+        "points"    :   options["points"],
+        "sweeps"    :   options["sweeps"],
+        "versions"  :   {
+            "sielib"    :   list(sielib.version_history.keys())[-1],
+            "sfitlib"   :   list(sfitlib.version_history.keys())[-1],
+            "splotlib"  :   list(splotlib.version_history.keys())[-1],
+            "python"    :   python_version.split()[0],
+            "numpy"     :   numpy.__version__,
+            "matplotlib":   matplotlib.__version__,
+            },
+        "stages"    :   results,
+        }
+    with open(options["output"], "a") as fh:
+        fh.write(dumps(record) + "\n")
+
+    # done
+    return record
+
+if __name__ == "__main__":
+
+    options = _options(argv[1:])
+    benchmark(options)
+
+    # done
+    lprint(f"done ({options['output']}).")
+    if _fh: _fh.close()
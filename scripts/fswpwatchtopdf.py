@@ -0,0 +1,59 @@
+#
+# file: fswpwatchtopdf.py
+# content: watch a folder and convert new frequency sweep(s) to pdf
+# created: 2026 October 17, Saturday
+# author: roch schanen
+# modified: 2026 October 17, Saturday
+# modification: long sweeps plotted as their envelope (decimate)
+# modification: the fswp2pdf watch layout (scmdlib.Watch), kept as a script
+# comment: Set debug "True" to run the script from sublime text
+
+"""
+    usage: fswpwatchtopdf.py [options] folder
+
+    same as "fswp2pdf watch --sidecar [options] folder": see scmdlib.py
+    for the options (--pattern, --interval, --settle, --output,
+    --existing, --retries, --cache). Stop with Ctrl-C.
+"""
+
+_DEBUG = False
+
+###########
+# IMPORTS #
+###########
+
+# built-in imports
+# ----------------
+from sys import argv
+
+# from the local package
+# ----------------------
+try:
+
+    # import from built
+    # -----------------
+    from fswp2pdf import scmdlib
+
+except ImportError as error:
+
+    # import from .
+    # -------------
+    import scmdlib
+
+#########
+# DEBUG #
+#########
+
+if _DEBUG:
+    argv = [
+        f"scriptname",
+        f"E:/schanen/work-python/fswp2pdf/.data/",
+        f"--existing",
+        ]
+
+###########
+# PROCESS #
+###########
+
+if __name__ == "__main__":
+    exit(scmdlib.main(["watch", "--sidecar", *argv[1:]]))
@@ -1,8 +1,8 @@
 # file: setup.py
 # content: setup file for fswp2pdf package
 # created: 2025 January 11 Saturday
-# modified:
-# modification:
+# modified: 2026 October 17, Saturday
+# modification: fswp2pdf console command (scmdlib.main)
 # author: roch schanen
 # comment:
 
@@ -21,6 +21,9 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/RochSchanen/fswp2pdf",
     packages = ['fswp2pdf'],
+    entry_points = {
+        "console_scripts": ["fswp2pdf = fswp2pdf.scmdlib:main"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",